@@ -0,0 +1,18 @@
+"""Pure-Python game engine for Dungeon Escape (no PgZero/pygame imports)."""
+
+from .core import (
+    Animation,
+    Character,
+    Enemy,
+    ENEMY_TYPES,
+    InputState,
+    LevelLayout,
+    Player,
+    Rect,
+    SlimeBlock,
+    SlimeFire,
+    SlimeNormal,
+    SlimeSpike,
+    Tuning,
+    World,
+)
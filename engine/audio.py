@@ -0,0 +1,153 @@
+"""Prioritized voice manager for sound effects.
+
+The front-end asks `VoiceManager.play(name)` instead of calling
+`sounds.<name>.play()` directly. The manager caps how many effects play at
+once, skips an effect still inside its cooldown (at most one "hit" every
+100 ms), steals the lowest-priority voice when every voice is busy and
+counts what was played, dropped and stolen.
+
+Backends do the actual playing:
+- SoundBackend wraps PgZero's `sounds` (pygame Sound objects and Channels)
+- NullBackend plays nothing and only simulates voice lengths, for headless
+  runs and machines without an audio device
+"""
+
+import time
+from collections import Counter
+
+# Priority and cooldown (seconds) of each effect; higher priority wins a voice
+SFX_RULES = {
+    "victory": (3, 0.0),
+    "gameover": (3, 0.0),
+    "start": (2, 0.0),
+    "nextlevel": (2, 0.0),
+    "pickup": (2, 0.0),
+    "hit": (1, 0.1),
+    "toggle": (0, 0.05),
+}
+# Rule of effects missing from the table
+DEFAULT_RULE = (1, 0.0)
+
+
+class SoundBackend:
+    """Play effects through PgZero's `sounds` object.
+
+    - sounds: the PgZero sounds loader (attribute access loads the effect)
+    """
+
+    def __init__(self, sounds):
+        self.sounds = sounds
+
+    def play(self, name):
+        """Start the effect; return its channel, or None if pygame had none free."""
+        sound = getattr(self.sounds, name)
+        channel = sound.play()
+        return (channel, sound) if channel is not None else None
+
+    def is_playing(self, voice):
+        channel, sound = voice
+        # Channels are reused: a busy channel may be playing another sound
+        return channel.get_busy() and channel.get_sound() is sound
+
+    def stop(self, voice):
+        if self.is_playing(voice):
+            voice[0].stop()
+
+
+class NullBackend:
+    """Silent backend: every voice simply lasts `duration` seconds.
+
+    - durations: optional {effect name: seconds}
+    - duration: length of effects missing from `durations`
+    - clock: time source, shared with the VoiceManager
+    """
+
+    def __init__(self, durations=None, duration=0.5, clock=time.monotonic):
+        self.durations = durations or {}
+        self.duration = duration
+        self.clock = clock
+
+    def play(self, name):
+        return [self.clock() + self.durations.get(name, self.duration)]
+
+    def is_playing(self, voice):
+        return self.clock() < voice[0]
+
+    def stop(self, voice):
+        voice[0] = 0.0
+
+
+class VoiceManager:
+    """Cap, prioritize and rate-limit sound effects.
+
+    - backend: SoundBackend or NullBackend
+    - max_voices: effects allowed to play at the same time
+    - rules: {effect name: (priority, cooldown seconds)}
+    - clock: time source for the cooldowns
+    """
+
+    def __init__(self, backend, max_voices=4, rules=SFX_RULES, clock=time.monotonic):
+        self.backend = backend
+        self.max_voices = max_voices
+        self.rules = rules
+        self.clock = clock
+        # Active voices: [priority, start time, name, backend voice]
+        self.voices = []
+        self.last_played = {}
+        self.played = Counter()
+        self.dropped = Counter()
+        self.stolen = Counter()
+
+    def play(self, name):
+        """Play effect `name` if its cooldown and the voice cap allow it.
+
+        Return True when the effect started.
+        """
+        priority, cooldown = self.rules.get(name, DEFAULT_RULE)
+        now = self.clock()
+        last = self.last_played.get(name)
+        if last is not None and now - last < cooldown:
+            self.dropped[name] += 1
+            return False
+
+        backend = self.backend
+        self._reap()
+        if len(self.voices) >= self.max_voices:
+            # Lowest priority first, oldest first among equals
+            victim = min(self.voices, key=lambda voice: (voice[0], voice[1]))
+            if victim[0] > priority:
+                self.dropped[name] += 1
+                return False
+            backend.stop(victim[3])
+            self.voices.remove(victim)
+            self.stolen[victim[2]] += 1
+
+        voice = backend.play(name)
+        if voice is None:
+            self.dropped[name] += 1
+            return False
+        self.voices.append([priority, now, name, voice])
+        self.last_played[name] = now
+        self.played[name] += 1
+        return True
+
+    def _reap(self):
+        """Forget the voices that finished playing."""
+        is_playing = self.backend.is_playing
+        self.voices = [voice for voice in self.voices if is_playing(voice[3])]
+
+    def stop_all(self):
+        """Stop every active effect."""
+        for voice in self.voices:
+            self.backend.stop(voice[3])
+        self.voices.clear()
+
+    def stats(self):
+        """Totals for overlays and logs."""
+        self._reap()
+        return {
+            "voices": len(self.voices),
+            "played": sum(self.played.values()),
+            "dropped": sum(self.dropped.values()),
+            "stolen": sum(self.stolen.values()),
+        }
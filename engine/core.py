@@ -0,0 +1,926 @@
+"""Dungeon Escape core engine (pure Python).
+
+World state, entities, level generation and the update step of the game,
+with no PgZero or pygame dependency. The PgZero front-end (main.py) is a
+thin adapter over this module: it reads the keyboard into an `InputState`,
+calls `World.update(dt, controls)`, turns the emitted events into sounds
+and draws the entities.
+
+Because nothing here opens a window, the game logic can be imported,
+tested and benchmarked headless:
+
+    world = World(seed=1)
+    world.start_game()
+    world.update(1 / 60, InputState(right=True))
+"""
+
+import random as _random
+from math import hypot
+from random import Random
+
+# Window and tile constants
+# The world is a grid of TILE_SIZE cells drawn inside the window.
+WIDTH = 800
+HEIGHT = 600
+TILE_SIZE = 40
+GRID_WIDTH = 20
+GRID_HEIGHT = 14
+HUD_HEIGHT = 40
+
+# Game states
+STATE_MENU = "menu"
+STATE_PLAYING = "playing"
+STATE_GAME_OVER = "game_over"
+STATE_VICTORY = "victory"
+STATE_PAUSED = "paused"
+
+# Number of levels to complete for the victory
+LEVEL_COUNT = 5
+
+# Default balance numbers: the entities start with them and Tuning's
+# defaults are these same values (tuning.json can override them)
+PLAYER_SPEED = 150
+INVULNERABILITY = 1.5
+# {enemy class name: (speed in pixels per second, chase radius in pixels)}
+ENEMY_STATS = {
+    "SlimeNormal": (50, 120),
+    "SlimeFire": (80, 200),
+    "SlimeBlock": (60, 100),
+    "SlimeSpike": (70, 150),
+}
+
+
+class Rect:
+    """Minimal axis-aligned rectangle with the pygame.Rect collision rules.
+
+    Only what the engine needs: position, size, center and overlap tests.
+    Edges that merely touch do not collide, as in pygame.
+    """
+
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @property
+    def center(self):
+        return (self.x + self.width / 2, self.y + self.height / 2)
+
+    @center.setter
+    def center(self, pos):
+        self.x = pos[0] - self.width / 2
+        self.y = pos[1] - self.height / 2
+
+    def colliderect(self, other):
+        """Return True when the two rectangles overlap."""
+        return (
+            self.x < other.x + other.width and other.x < self.x + self.width
+            and self.y < other.y + other.height and other.y < self.y + self.height
+        )
+
+    def collidepoint(self, pos):
+        """Return True when the point lies inside the rectangle."""
+        return self.x <= pos[0] < self.x + self.width and self.y <= pos[1] < self.y + self.height
+
+    def union(self, other):
+        """Return the smallest rectangle containing both rectangles."""
+        x = min(self.x, other.x)
+        y = min(self.y, other.y)
+        right = max(self.x + self.width, other.x + other.width)
+        bottom = max(self.y + self.height, other.y + other.height)
+        return Rect(x, y, right - x, bottom - y)
+
+    def clip(self, other):
+        """Return the part of this rectangle inside `other` (may be empty)."""
+        x = max(self.x, other.x)
+        y = max(self.y, other.y)
+        right = min(self.x + self.width, other.x + other.width)
+        bottom = min(self.y + self.height, other.y + other.height)
+        return Rect(x, y, max(0, right - x), max(0, bottom - y))
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __eq__(self, other):
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
+
+
+class Animation:
+    """Frame-based animation helper for sprites.
+
+    - frames: list of image names (strings) loadable by the front-end
+    - fps: frames per second (animation speed)
+    """
+
+    def __init__(self, frames, fps=8):
+        self.frames = frames
+        self.fps = fps
+        self.current_frame = 0
+        self.time_accumulated = 0.0
+
+    def update(self, dt):
+        """Advance the animation based on elapsed time (dt in seconds)."""
+        self.time_accumulated += dt
+        frame_duration = 1.0 / self.fps
+
+        while self.time_accumulated >= frame_duration:
+            self.time_accumulated -= frame_duration
+            self.current_frame = (self.current_frame + 1) % len(self.frames)
+
+    def get_current_frame(self):
+        """Return the name of the current frame image."""
+        return self.frames[self.current_frame]
+
+    def reset(self):
+        """Reset to the first frame and clear accumulated time."""
+        self.current_frame = 0
+        self.time_accumulated = 0.0
+
+
+class InputState:
+    """Directional controls for one tick (filled by the front-end or a bot)."""
+
+    __slots__ = ("left", "right", "up", "down")
+
+    def __init__(self, left=False, right=False, up=False, down=False):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.down = down
+
+
+class Character:
+    """Base class for entities with movement, collisions and animations.
+
+    Responsibilities:
+    - manage position, direction and speed
+    - axis-aligned collision with walls using Rect (AABB)
+    - pick and update the current animation (idle/move)
+    """
+
+    def __init__(self, x, y, speed, hitbox_size=20):
+        """Initialize the character.
+
+        Parameters:
+        - x, y: initial pixel coordinates (center)
+        - speed: pixels per second
+        - hitbox_size: side of the square hitbox (px)
+        """
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.dx = 0
+        self.dy = 0
+        self.state = "idle"
+        self.animations = {}
+        # Render handle (e.g. a PgZero Actor) attached by the front-end
+        self.actor = None
+        # Smaller and centered hitbox
+        half_size = hitbox_size // 2
+        self.hitbox = Rect(x - half_size, y - half_size, hitbox_size, hitbox_size)
+
+    def setup_animations(self, idle_frames, move_frames):
+        """Register 'idle' and 'move' animations."""
+        self.animations["idle"] = Animation(idle_frames, fps=6)
+        self.animations["move"] = Animation(move_frames, fps=8)
+
+    @property
+    def image(self):
+        """Name of the image to draw for the current animation frame."""
+        anim = self.animations.get(self.state) or self.animations.get("idle")
+        return anim.get_current_frame() if anim else None
+
+    def place(self, x, y):
+        """Teleport the character to (x, y), keeping the hitbox in sync."""
+        self.x = x
+        self.y = y
+        self.hitbox.center = (x, y)
+
+    def move(self, dt, walls):
+        """Update position using normalized input and handle wall collisions."""
+        if abs(self.dx) > 0.01 or abs(self.dy) > 0.01:
+            self.state = "move"
+        else:
+            self.state = "idle"
+
+        # Normalize diagonal movement so diagonals are not faster
+        mag = hypot(self.dx, self.dy)
+        if mag > 0:
+            self.dx /= mag
+            self.dy /= mag
+
+        # Calculate new position
+        new_x = self.x + self.dx * self.speed * dt
+        new_y = self.y + self.dy * self.speed * dt
+
+        # Check collision with walls: create hitbox at new position
+        half_size = self.hitbox.width // 2
+        new_hitbox = Rect(new_x - half_size, new_y - half_size, self.hitbox.width, self.hitbox.height)
+        collision = False
+
+        for wall in walls:
+            if new_hitbox.colliderect(wall):
+                collision = True
+                break
+
+        # Update position if no collision
+        if not collision:
+            # Keep within screen bounds
+            margin = self.hitbox.width // 2
+            self.place(
+                max(margin, min(WIDTH - margin, new_x)),
+                max(margin, min(HEIGHT - HUD_HEIGHT - margin, new_y)),
+            )
+
+    def update_animation(self, dt, freeze_idle=False):
+        """Advance the current state's animation (idle ones can be frozen)."""
+        if freeze_idle and self.state == "idle":
+            return
+        if self.state in self.animations:
+            self.animations[self.state].update(dt)
+
+
+class Player(Character):
+    """Player entity: handles input, health and invulnerability."""
+
+    def __init__(self, x, y):
+        """Create the player with default animations and hitbox."""
+        # Player sprite pre-scaled to 32x32, hitbox 22 px
+        super().__init__(x, y, speed=PLAYER_SPEED, hitbox_size=22)
+        self.health = 3
+        self.max_health = 3
+        self.invulnerable_timer = 0
+        # Seconds of invulnerability after a hit (see Tuning)
+        self.invulnerability = INVULNERABILITY
+
+        # Setup player animations with new character_beige sprites
+        self.setup_animations(
+            idle_frames=["characters/character_beige_idle", "characters/character_beige_idle"],
+            move_frames=["characters/character_beige_walk_a", "characters/character_beige_walk_b"]
+        )
+
+    def handle_input(self, controls):
+        """Read the directional controls and set movement direction."""
+        self.dx = 0
+        self.dy = 0
+
+        if controls.left:
+            self.dx = -1
+        if controls.right:
+            self.dx = 1
+        if controls.up:
+            self.dy = -1
+        if controls.down:
+            self.dy = 1
+
+    def take_damage(self, amount=1):
+        """Apply damage when not invulnerable; return True if it was applied."""
+        if self.invulnerable_timer > 0:
+            return False
+        self.health -= amount
+        self.invulnerable_timer = self.invulnerability
+        return True
+
+    def update(self, dt, walls, controls, freeze_idle=False):
+        """Update invulnerability timer, movement and animation."""
+        # Update invulnerability timer
+        if self.invulnerable_timer > 0:
+            self.invulnerable_timer -= dt
+
+        self.handle_input(controls)
+        self.move(dt, walls)
+        self.update_animation(dt, freeze_idle)
+
+
+class Enemy(Character):
+    """Base enemy class: each subclass implements `think` (AI).
+
+    rng: source of randomness for the AI (defaults to the `random` module);
+    the World passes its own seeded generator so runs are reproducible.
+    """
+
+    def __init__(self, x, y, speed, rng=None):
+        """Initialize a generic enemy with speed and hitbox."""
+        # Enemy sprite pre-scaled to 32x32, hitbox 20 px
+        super().__init__(x, y, speed, hitbox_size=20)
+        self.rng = rng if rng is not None else _random
+        self.behavior_timer = 0
+        # Time elapsed since the last think() (AI may run less than every tick)
+        self.think_time = 0.0
+
+    def think(self, player_pos, dt):
+        """Decide enemy dx/dy based on player position (override)."""
+        pass
+
+    def update(self, dt, player_pos, walls, think=True, freeze_idle=False):
+        """Update AI, movement and animation.
+
+        With think=False the AI is skipped for this tick: the enemy keeps its
+        direction and the next think() receives the whole elapsed time.
+        """
+        self.think_time += dt
+        if think:
+            self.think(player_pos, self.think_time)
+            self.think_time = 0.0
+        self.move(dt, walls)
+        self.update_animation(dt, freeze_idle)
+
+
+class SlimeNormal(Enemy):
+    """Green slime: wanders randomly, chases when close."""
+
+    def __init__(self, x, y, rng=None):
+        speed, self.chase_radius = ENEMY_STATS["SlimeNormal"]
+        super().__init__(x, y, speed=speed, rng=rng)
+        self.setup_animations(
+            idle_frames=["enemies/slime_normal_rest", "enemies/slime_normal_rest"],
+            move_frames=["enemies/slime_normal_walk_a", "enemies/slime_normal_walk_b"]
+        )
+        self.wander_direction()
+
+    def wander_direction(self):
+        """Pick a random direction to wander for a while."""
+        directions = [(1, 0), (-1, 0), (0, 1), (0, -1), (0.7, 0.7), (-0.7, 0.7)]
+        direction = self.rng.choice(directions)
+        self.dx = direction[0]
+        self.dy = direction[1]
+        self.behavior_timer = 1.0 + self.rng.random()
+
+    def think(self, player_pos, dt):
+        """Chase within chase_radius, otherwise keep wandering."""
+        self.behavior_timer -= dt
+
+        # Calculate distance to player
+        dist = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
+
+        if dist < self.chase_radius:
+            # Chase player
+            if dist > 0:
+                self.dx = (player_pos[0] - self.x) / dist
+                self.dy = (player_pos[1] - self.y) / dist
+        elif self.behavior_timer <= 0:
+            # Wander randomly
+            self.wander_direction()
+
+
+class SlimeFire(Enemy):
+    """Fire slime: faster; actively hunts the player."""
+
+    def __init__(self, x, y, rng=None):
+        speed, self.chase_radius = ENEMY_STATS["SlimeFire"]
+        super().__init__(x, y, speed=speed, rng=rng)
+        self.setup_animations(
+            idle_frames=["enemies/slime_fire_rest", "enemies/slime_fire_rest"],
+            move_frames=["enemies/slime_fire_walk_a", "enemies/slime_fire_walk_b"]
+        )
+        self.patrol_timer = 0
+
+    def think(self, player_pos, dt):
+        """Chase within chase_radius, otherwise patrol with short intervals."""
+        dist = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
+
+        if dist < self.chase_radius:  # Detection radius
+            # Direct pursuit
+            if dist > 0:
+                self.dx = (player_pos[0] - self.x) / dist
+                self.dy = (player_pos[1] - self.y) / dist
+        else:
+            # Patrol behavior
+            self.patrol_timer -= dt
+            if self.patrol_timer <= 0:
+                self.dx = self.rng.choice([-1, 0, 1])
+                self.dy = self.rng.choice([-1, 0, 1])
+                self.patrol_timer = 2.0
+
+
+class SlimeBlock(Enemy):
+    """Block slime: patrols between two points; attacks when nearby."""
+
+    def __init__(self, x, y, rng=None):
+        speed, self.chase_radius = ENEMY_STATS["SlimeBlock"]
+        super().__init__(x, y, speed=speed, rng=rng)
+        self.setup_animations(
+            idle_frames=["enemies/slime_block_rest", "enemies/slime_block_rest"],
+            move_frames=["enemies/slime_block_walk_a", "enemies/slime_block_walk_b"]
+        )
+        self.patrol_points = [(x - 80, y), (x + 80, y)]
+        self.current_target = 0
+
+    def think(self, player_pos, dt):
+        """Chase if close to the player; otherwise follow patrol points."""
+        dist_to_player = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
+
+        if dist_to_player < self.chase_radius:  # Attack radius
+            # Chase player
+            if dist_to_player > 0:
+                self.dx = (player_pos[0] - self.x) / dist_to_player
+                self.dy = (player_pos[1] - self.y) / dist_to_player
+        else:
+            # Patrol between points
+            target = self.patrol_points[self.current_target]
+            dist_to_target = hypot(target[0] - self.x, target[1] - self.y)
+
+            if dist_to_target < 10:  # Reached patrol point
+                self.current_target = (self.current_target + 1) % len(self.patrol_points)
+                target = self.patrol_points[self.current_target]
+
+            # Move towards patrol point
+            if dist_to_target > 0:
+                self.dx = (target[0] - self.x) / dist_to_target
+                self.dy = (target[1] - self.y) / dist_to_target
+
+
+class SlimeSpike(Enemy):
+    """Spike slime: alternates aggressive chase and erratic movement."""
+
+    def __init__(self, x, y, rng=None):
+        speed, self.chase_radius = ENEMY_STATS["SlimeSpike"]
+        super().__init__(x, y, speed=speed, rng=rng)
+        self.setup_animations(
+            idle_frames=["enemies/slime_spike_rest", "enemies/slime_spike_rest"],
+            move_frames=["enemies/slime_spike_walk_a", "enemies/slime_spike_walk_b"]
+        )
+        self.change_direction_timer = 0
+        self.is_aggressive = False
+
+    def think(self, player_pos, dt):
+        """Aggressive within chase_radius; otherwise moves unpredictably."""
+        self.change_direction_timer -= dt
+        dist = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
+
+        if dist < self.chase_radius:  # Detection radius
+            # Aggressive mode: chase player directly
+            self.is_aggressive = True
+            if dist > 0:
+                self.dx = (player_pos[0] - self.x) / dist
+                self.dy = (player_pos[1] - self.y) / dist
+        else:
+            # Erratic movement mode
+            if self.change_direction_timer <= 0:
+                # Change direction randomly every 0.5-1.5 seconds
+                self.dx = self.rng.choice([-1, -0.7, 0, 0.7, 1])
+                self.dy = self.rng.choice([-1, -0.7, 0, 0.7, 1])
+                self.change_direction_timer = 0.5 + self.rng.random()
+                self.is_aggressive = False
+
+
+# Enemy classes indexed by the value returned by World.choose_enemy_type
+ENEMY_TYPES = (SlimeNormal, SlimeFire, SlimeBlock, SlimeSpike)
+
+
+class Tuning:
+    """Balance numbers of the game; the defaults are the original values.
+
+    Designers edit them in a data file that is reloaded while the game runs
+    (engine/tuning.py). Per-level tables fall back to the closest lower
+    level (the last entry covers every level after it).
+
+    - player_speed: pixels per second
+    - invulnerability: seconds of invulnerability after a hit
+    - enemies: {class name: (speed, chase radius)}
+    - walls_by_level, enemy_count_by_level: {level: count}
+    - enemy_weights_by_level: {level: weights in ENEMY_TYPES order}
+    """
+
+    def __init__(self, player_speed=PLAYER_SPEED, invulnerability=INVULNERABILITY, enemies=None,
+                 walls_by_level=None, enemy_count_by_level=None, enemy_weights_by_level=None):
+        self.player_speed = player_speed
+        self.invulnerability = invulnerability
+        self.enemies = enemies or dict(ENEMY_STATS)
+        # Difficulty tuning per level (kid-friendly, explicit numbers)
+        self.walls_by_level = walls_by_level or {1: 7, 2: 9, 3: 12, 4: 15, 5: 18}
+        self.enemy_count_by_level = enemy_count_by_level or {1: 3, 2: 4, 3: 6, 4: 7, 5: 9}
+        # Level 1 only SlimeNormal; more aggressive slimes at higher levels
+        self.enemy_weights_by_level = enemy_weights_by_level or {
+            1: (1, 0, 0, 0),
+            2: (0.70, 0.30, 0, 0),
+            3: (0.40, 0.35, 0.25, 0),
+            4: (0.25, 0.35, 0.25, 0.15),
+            5: (0.15, 0.30, 0.30, 0.25),
+        }
+        # Cumulative thresholds, rounded so that 0.15 + 0.30 is exactly 0.45
+        self.enemy_thresholds_by_level = {}
+        for level, weights in self.enemy_weights_by_level.items():
+            total = sum(weights)
+            running = 0
+            thresholds = []
+            for weight in weights:
+                running += weight
+                thresholds.append(round(running / total, 9))
+            self.enemy_thresholds_by_level[level] = thresholds
+
+    @staticmethod
+    def for_level(table, level):
+        """Entry of `table` for `level`: exact, else closest lower, else the first."""
+        if level in table:
+            return table[level]
+        lower = [key for key in table if key <= level]
+        return table[max(lower) if lower else min(table)]
+
+    def apply(self, character):
+        """Copy the numbers of this tuning onto a live player or enemy."""
+        if isinstance(character, Player):
+            character.speed = self.player_speed
+            character.invulnerability = self.invulnerability
+        else:
+            character.speed, character.chase_radius = self.enemies[type(character).__name__]
+
+
+class LevelLayout:
+    """Everything a level is made of, in grid tiles (tx, ty).
+
+    Generated levels can be reduced to a layout (`from_world`) and any
+    layout can be loaded back into a world (`World.load_layout`), which is
+    how pre-baked levels are stored and replayed (see engine/levelbank.py).
+
+    - level: level number the layout was made for
+    - walls: set of wall tiles (borders included)
+    - player, key, door: tiles of the spawn, key and door
+    - enemies: list of (index in ENEMY_TYPES, tx, ty)
+    """
+
+    __slots__ = ("level", "walls", "player", "key", "door", "enemies")
+
+    def __init__(self, level, walls, player, key, door, enemies):
+        self.level = level
+        self.walls = walls
+        self.player = player
+        self.key = key
+        self.door = door
+        self.enemies = enemies
+
+    @classmethod
+    def from_world(cls, world):
+        """Reduce the level currently loaded in `world` to a layout."""
+        def tile(pos):
+            return (int(pos[0]) // TILE_SIZE, int(pos[1]) // TILE_SIZE)
+
+        walls = {(wall.x // TILE_SIZE, wall.y // TILE_SIZE) for wall in world.walls}
+        enemies = [
+            (ENEMY_TYPES.index(type(enemy)),) + tile((enemy.x, enemy.y))
+            for enemy in world.enemies
+        ]
+        return cls(
+            world.current_level, walls, tile((world.player.x, world.player.y)),
+            tile(world.key_position), tile(world.door_position), enemies,
+        )
+
+
+class World:
+    """Complete state of one game session plus the rules that advance it.
+
+    The world never plays sounds or draws: whatever the front-end needs to
+    react to is appended to `events` as (name, data) pairs and collected
+    with `drain_events()`. Event names:
+    - "game_started", "level_generated", "level_completed", "next_level"
+    - "hit", "key_collected", "game_over", "victory", "quit"
+
+    seed: optional seed for the world's random generator (reproducible runs)
+    """
+
+    def __init__(self, seed=None):
+        self.rng = Random(seed)
+        self.state = STATE_MENU
+        self.current_level = 1
+        self.player = None
+        self.enemies = []
+        self.walls = []
+        self.floor_tiles = []
+        self.key_collected = False
+        self.door_position = None
+        self.key_position = None
+        self.level_time_accum = 0.0
+        self.level_times = []
+        self.events = []
+        self.tick = 0
+        # Quality knobs (see engine/governor.py): frozen idle animations and
+        # AI run once every `ai_interval` ticks (staggered across enemies)
+        self.freeze_idle_animations = False
+        self.ai_interval = 1
+        # Balance numbers, replaced live by apply_tuning() (engine/tuning.py)
+        self.tuning = Tuning()
+        # Hand-authored levels (engine/tilemap.py): {level: LevelLayout or
+        # list of layouts to pick from}; other levels are generated
+        self.authored_levels = {}
+        # Optional pre-baked levels (engine/levelbank.py): when set, levels
+        # are picked from the bank instead of generated
+        self.level_bank = None
+
+    def emit(self, name, **data):
+        """Record an event for the front-end."""
+        self.events.append((name, data))
+
+    def drain_events(self):
+        """Return the pending events and clear the queue."""
+        events = self.events
+        self.events = []
+        return events
+
+    def generate_level(self, level_num):
+        """Generate a dungeon level and place entities.
+
+        Steps:
+        1) Create border walls + some random internal walls
+        2) Compute the list of free floor tiles
+        3) Place player, key, door and enemies on free tiles only
+
+        level_num: int (1..5) used to tune difficulty
+
+        Levels listed in `authored_levels` are loaded from their hand-made
+        layout instead, then the level bank is tried, if there is one.
+        """
+        authored = self.authored_levels.get(level_num)
+        if authored:
+            if isinstance(authored, (list, tuple)):
+                authored = self.rng.choice(authored)
+            self.load_layout(authored)
+            return
+        if self.level_bank is not None:
+            layout = self.level_bank.pick(level_num, self.rng)
+            if layout is not None:
+                self.load_layout(layout)
+                return
+
+        rng = self.rng
+        walls = self.walls
+        floor_tiles = self.floor_tiles
+        walls.clear()
+        floor_tiles.clear()
+        self.enemies.clear()
+
+        # 1) Create border walls (a rectangle around the play area)
+        for x in range(GRID_WIDTH):
+            walls.append(Rect(x * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE))
+            walls.append(Rect(x * TILE_SIZE, (GRID_HEIGHT - 1) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+        for y in range(1, GRID_HEIGHT - 1):
+            walls.append(Rect(0, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+            walls.append(Rect((GRID_WIDTH - 1) * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+        # Difficulty tuning per level (see Tuning)
+        tuning = self.tuning
+        internal_walls = tuning.for_level(tuning.walls_by_level, level_num)
+        enemy_count = tuning.for_level(tuning.enemy_count_by_level, level_num)
+
+        # Add some random internal walls
+        for _ in range(internal_walls):
+            x = rng.randint(2, GRID_WIDTH - 3)
+            y = rng.randint(2, GRID_HEIGHT - 3)
+            walls.append(Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+        # 2) Create floor tiles (all non-wall cells in the grid)
+        self._fill_floor({(wall.x, wall.y) for wall in walls})
+
+        # Helper: choose always-free tiles and use their centers for spawns
+        free_tiles = set(floor_tiles)
+        TILE_HALF = TILE_SIZE // 2
+
+        def tile_center(tile_pos):
+            tx, ty = tile_pos
+            return (tx + TILE_HALF, ty + TILE_HALF)
+
+        def distance(a, b):
+            return hypot(a[0] - b[0], a[1] - b[1])
+
+        def take_free_tile(min_dist_px=0, from_pos=None):
+            # Try to pick a tile far enough from from_pos (if provided)
+            if not free_tiles:
+                # Safety: if nothing free (shouldn't happen), fall back to center
+                return (WIDTH // 2, (HEIGHT - HUD_HEIGHT) // 2)
+            # Sorted so the same seed always gives the same level
+            candidates = sorted(free_tiles)
+            # Shuffle-by-choice: sample up to len(candidates) tries
+            for _ in range(len(candidates)):
+                t = rng.choice(candidates)
+                c = tile_center(t)
+                if from_pos is None or distance(c, from_pos) >= min_dist_px:
+                    free_tiles.discard(t)
+                    return c
+            # If no candidate met the distance, just take any
+            t = candidates[0]
+            free_tiles.discard(t)
+            return tile_center(t)
+
+        # 3) Place player on a guaranteed free tile (no health reset here)
+        player = self._place_player(take_free_tile())
+
+        # Place key far from player (at least 6 tiles away)
+        self.key_position = take_free_tile(min_dist_px=6 * TILE_SIZE, from_pos=(player.x, player.y))
+
+        # Keep door position stable-ish: pick a free tile near the right side
+        # Try to pick a tile roughly to the right-center area
+        preferred = sorted(list(free_tiles), key=lambda t: (-t[0], abs((t[1]+TILE_HALF) - HEIGHT//2)))
+        door_tile = preferred[0] if preferred else None
+        if door_tile:
+            free_tiles.discard(door_tile)
+            self.door_position = tile_center(door_tile)
+        else:
+            self.door_position = (WIDTH - 100, HEIGHT // 2)
+
+        # Spawn enemies based on level on guaranteed free tiles
+        for i in range(enemy_count):
+            ex, ey = take_free_tile(min_dist_px=2 * TILE_SIZE, from_pos=(player.x, player.y))
+            enemy_type = self.choose_enemy_type(level_num)
+            enemy = ENEMY_TYPES[enemy_type](ex, ey, rng=rng)
+            tuning.apply(enemy)
+            self.enemies.append(enemy)
+
+        self.emit(
+            "level_generated",
+            level=level_num,
+            enemy_types=[type(enemy).__name__ for enemy in self.enemies],
+        )
+
+    def load_layout(self, layout):
+        """Load a ready-made level (`LevelLayout`) instead of generating one.
+
+        Consumes no random numbers for the placement, so the same layout
+        gives the same level on every machine.
+        """
+        half = TILE_SIZE // 2
+        self.walls.clear()
+        self.enemies.clear()
+        wall_tiles = set()
+        for tx, ty in sorted(layout.walls):
+            x, y = tx * TILE_SIZE, ty * TILE_SIZE
+            self.walls.append(Rect(x, y, TILE_SIZE, TILE_SIZE))
+            wall_tiles.add((x, y))
+        self._fill_floor(wall_tiles)
+
+        self._place_player((layout.player[0] * TILE_SIZE + half, layout.player[1] * TILE_SIZE + half))
+        self.key_position = (layout.key[0] * TILE_SIZE + half, layout.key[1] * TILE_SIZE + half)
+        self.door_position = (layout.door[0] * TILE_SIZE + half, layout.door[1] * TILE_SIZE + half)
+        for enemy_type, tx, ty in layout.enemies:
+            enemy = ENEMY_TYPES[enemy_type](tx * TILE_SIZE + half, ty * TILE_SIZE + half, rng=self.rng)
+            self.tuning.apply(enemy)
+            self.enemies.append(enemy)
+
+        self.emit(
+            "level_generated",
+            level=self.current_level,
+            enemy_types=[type(enemy).__name__ for enemy in self.enemies],
+        )
+
+    def _fill_floor(self, wall_tiles):
+        """Rebuild `floor_tiles`: every grid cell whose corner is not in `wall_tiles`.
+
+        Walls are always whole tiles, so a set lookup replaces testing each
+        cell against every wall.
+        """
+        floor_tiles = self.floor_tiles
+        floor_tiles.clear()
+        for x in range(0, GRID_WIDTH * TILE_SIZE, TILE_SIZE):
+            for y in range(0, GRID_HEIGHT * TILE_SIZE, TILE_SIZE):
+                if (x, y) not in wall_tiles:
+                    floor_tiles.append((x, y))
+
+    def _place_player(self, pos):
+        """Create the player at `pos`, or move the existing one (health is kept)."""
+        player = self.player
+        if player is None:
+            player = self.player = Player(pos[0], pos[1])
+            self.tuning.apply(player)
+        else:
+            player.place(*pos)
+            player.dx, player.dy = 0, 0
+            player.state = "idle"
+            player.invulnerable_timer = 0
+        return player
+
+    def choose_enemy_type(self, level_num):
+        """Return 0=SlimeNormal, 1=SlimeFire, 2=SlimeBlock, 3=SlimeSpike with level-based weights.
+
+        The weights (Tuning.enemy_weights_by_level) ramp up difficulty at
+        higher levels by introducing more aggressive slime types.
+        """
+        r = self.rng.random()
+        thresholds = self.tuning.for_level(self.tuning.enemy_thresholds_by_level, level_num)
+        for enemy_type, threshold in enumerate(thresholds):
+            if r < threshold:
+                return enemy_type
+        return len(thresholds) - 1
+
+    def apply_tuning(self, tuning):
+        """Switch to new balance numbers, updating the live player and enemies.
+
+        Wall and enemy counts and the enemy mix take effect from the next
+        generated level.
+        """
+        self.tuning = tuning
+        if self.player is not None:
+            tuning.apply(self.player)
+        for enemy in self.enemies:
+            tuning.apply(enemy)
+
+    def start_game(self):
+        """Start a new game: reset level, player and per-level timers."""
+        self.state = STATE_PLAYING
+        self.current_level = 1
+        self.key_collected = False
+        self.player = None  # reset player so health returns to max for a new game
+        self.level_times = []
+        self.level_time_accum = 0.0
+        self.emit("game_started")
+        self.generate_level(self.current_level)
+
+    def pause(self):
+        """Enter the pause state."""
+        self.state = STATE_PAUSED
+
+    def resume(self):
+        """Resume the game from pause."""
+        self.state = STATE_PLAYING
+
+    def quit_to_menu(self):
+        """Leave the current run (or an end screen) and go back to the menu."""
+        if self.state in (STATE_PLAYING, STATE_PAUSED):
+            self.emit("quit", level=self.current_level, time=self.level_time_accum)
+        self.state = STATE_MENU
+
+    def game_over(self):
+        """Handle game over: save the time of the level being played."""
+        # Save current level time at the moment of defeat
+        level_time = self.level_time_accum
+        self.level_times.append(level_time)
+        self.level_time_accum = 0.0
+        self.state = STATE_GAME_OVER
+        self.emit("game_over", level=self.current_level, time=level_time, x=self.player.x, y=self.player.y)
+
+    def victory(self):
+        """Handle victory (all levels completed)."""
+        self.state = STATE_VICTORY
+        self.emit("victory")
+
+    def next_level(self):
+        """Advance to the next level, saving the time of the level just finished."""
+        # Save completed level time
+        self.level_times.append(self.level_time_accum)
+        self.emit("level_completed", level=self.current_level, time=self.level_time_accum)
+        self.level_time_accum = 0.0
+        self.current_level += 1
+        self.key_collected = False
+
+        if self.current_level > LEVEL_COUNT:  # Win after 5 levels
+            self.victory()
+        else:
+            self.generate_level(self.current_level)
+            self.emit("next_level", level=self.current_level)
+
+    def key_rect(self):
+        """Pickup area of the key (sprite 32x32, area 24x24 centered)."""
+        key_pickup_size = 24
+        half = key_pickup_size // 2
+        return Rect(self.key_position[0] - half, self.key_position[1] - half, key_pickup_size, key_pickup_size)
+
+    def door_rect(self):
+        """Interaction area of the door (40x40 = 1 tile)."""
+        return Rect(self.door_position[0] - 20, self.door_position[1] - 20, 40, 40)
+
+    def update(self, dt, controls):
+        """Advance the simulation by dt seconds (only while playing).
+
+        Parameters:
+        - dt: delta time in seconds since the last frame
+        - controls: InputState (or any object with left/right/up/down)
+        """
+        if self.state != STATE_PLAYING:
+            return
+
+        player = self.player
+        self.tick += 1
+        freeze_idle = self.freeze_idle_animations
+        ai_interval = self.ai_interval
+        # Accumulate current level time
+        self.level_time_accum += dt
+        # Update player
+        player.update(dt, self.walls, controls, freeze_idle)
+
+        # Update enemies
+        player_pos = (player.x, player.y)
+        for i, enemy in enumerate(self.enemies):
+            think = ai_interval <= 1 or (self.tick + i) % ai_interval == 0
+            enemy.update(dt, player_pos, self.walls, think, freeze_idle)
+
+            # Check collision with player
+            if enemy.hitbox.colliderect(player.hitbox) and player.take_damage():
+                self.emit("hit", health=player.health, x=player.x, y=player.y)
+                if player.health <= 0:
+                    self.game_over()
+                    return
+
+        # Check key collection
+        if not self.key_collected and self.key_position:
+            if player.hitbox.colliderect(self.key_rect()):
+                self.key_collected = True
+                self.emit("key_collected")
+
+        # Check door interaction
+        if self.key_collected and self.door_position:
+            if player.hitbox.colliderect(self.door_rect()):
+                self.next_level()
@@ -0,0 +1,92 @@
+"""Adaptive quality governor driven by the frame time.
+
+The governor watches a moving average of the frame time and steps down
+through quality tiers when it goes over budget, then back up once there
+is headroom again. Hysteresis keeps it from oscillating: stepping down
+and up use different thresholds, and after every change the tier is held
+for at least `hold` seconds.
+
+Tiers (each one keeps the savings of the previous ones):
+- 0 "full":         everything on
+- 1 "static idle":  idle animations are frozen
+- 2 "slow AI":      enemy AI runs every other tick (staggered)
+- 3 "cached HUD":   the HUD is reused and re-rendered only when it changes
+"""
+
+from collections import deque
+
+TIER_NAMES = ("full", "static idle", "slow AI", "cached HUD")
+
+
+class QualityGovernor:
+    """Pick the quality tier from the recent frame times.
+
+    - budget: target frame time in seconds (1/30 = never below 30 fps)
+    - window: number of frames in the moving average
+    - step_down: step down when the average exceeds budget * step_down
+    - step_up: step up when the average falls below budget * step_up
+    - hold: seconds to keep a tier before changing it again
+    """
+
+    def __init__(self, budget=1 / 30, window=30, step_down=0.85, step_up=0.6, hold=1.0):
+        self.budget = budget
+        self.window = window
+        self.step_down = step_down
+        self.step_up = step_up
+        self.hold = hold
+        self.tier = 0
+        self.frame_times = deque(maxlen=window)
+        self.total = 0.0
+        self.held = 0.0
+
+    @property
+    def average(self):
+        """Moving average of the frame time (seconds)."""
+        return self.total / len(self.frame_times) if self.frame_times else 0.0
+
+    def frame(self, frame_time):
+        """Record one frame time (seconds) and return the current tier."""
+        if len(self.frame_times) == self.window:
+            self.total -= self.frame_times[0]
+        self.frame_times.append(frame_time)
+        self.total += frame_time
+        self.held += frame_time
+
+        if self.held < self.hold or len(self.frame_times) < self.window:
+            return self.tier
+        average = self.average
+        if average > self.budget * self.step_down and self.tier < len(TIER_NAMES) - 1:
+            self.set_tier(self.tier + 1)
+        elif average < self.budget * self.step_up and self.tier > 0:
+            self.set_tier(self.tier - 1)
+        return self.tier
+
+    def set_tier(self, tier):
+        """Switch tier and start a new hold period."""
+        self.tier = tier
+        self.held = 0.0
+
+    @property
+    def freeze_idle_animations(self):
+        return self.tier >= 1
+
+    @property
+    def ai_interval(self):
+        return 2 if self.tier >= 2 else 1
+
+    @property
+    def cache_hud(self):
+        return self.tier >= 3
+
+    def apply(self, world):
+        """Copy the knobs of the current tier onto the world."""
+        world.freeze_idle_animations = self.freeze_idle_animations
+        world.ai_interval = self.ai_interval
+
+    def status(self):
+        """Current tier and timing, for overlays and profiler output."""
+        return {
+            "tier": self.tier,
+            "tier_name": TIER_NAMES[self.tier],
+            "frame_ms": round(self.average * 1000, 2),
+        }
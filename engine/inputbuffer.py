@@ -0,0 +1,173 @@
+"""Event-driven input with timestamps, and key-to-screen latency.
+
+Polling the keyboard once per update() loses a tap that starts and ends
+between two frames. `InputBuffer` keeps every key event in a fixed-size
+ring buffer with a perf_counter() timestamp; `tick()` hands the events
+received since the previous tick to the simulation, so a direction
+pressed even for a moment is applied for at least one tick.
+
+`LatencyHistogram` measures, for each key-down used by a tick, the time
+from its timestamp (taken with perf_counter() when the front-end handles
+the event) until the first frame that shows the change has been presented
+(after the flip). pygame events carry no OS timestamp, so the time a key
+waits in the OS queue before the event pump reads it is not included: at
+most the frame pacing wait (clock.tick()). That wait is measured
+separately (`frame_started()`: previous flip to the start of the next
+update) and reported next to the histogram, so the two can be compared.
+"""
+
+import time
+from collections import deque
+
+from .core import InputState
+
+DIRECTIONS = ("left", "right", "up", "down")
+# Histogram bucket upper bounds, milliseconds (the last bucket is open)
+LATENCY_BUCKETS_MS = (4, 8, 12, 17, 25, 33, 50, 67, 100)
+
+
+class InputBuffer:
+    """Ring buffer of directional key events, consumed once per tick.
+
+    - capacity: events kept; older unread events are dropped (and counted)
+    - clock: time source for the timestamps
+    """
+
+    def __init__(self, capacity=256, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.times = [0.0] * capacity
+        self.directions = [0] * capacity
+        self.downs = [False] * capacity
+        self.written = 0
+        self.read = 0
+        self.dropped = 0
+        self.held = [False] * len(DIRECTIONS)
+
+    def push(self, direction, down, timestamp=None):
+        """Record a key-down (down=True) or key-up of a direction name."""
+        slot = self.written % self.capacity
+        self.times[slot] = self.clock() if timestamp is None else timestamp
+        self.directions[slot] = DIRECTIONS.index(direction)
+        self.downs[slot] = down
+        self.written += 1
+        if self.written - self.read > self.capacity:
+            self.dropped += self.written - self.read - self.capacity
+            self.read = self.written - self.capacity
+
+    def discard(self):
+        """Forget unread events (e.g. keys pressed while paused)."""
+        self.read = self.written
+
+    def tick(self, held=None):
+        """Controls for the next simulation tick.
+
+        - held: InputState polled from the keyboard, or None to rely on the
+          key-up events alone
+
+        Return (InputState, timestamps of the key-downs used). A direction
+        is on if it is held or was pressed since the previous tick.
+        """
+        pressed = [False] * len(DIRECTIONS)
+        presses = []
+        for index in range(self.read, self.written):
+            slot = index % self.capacity
+            direction = self.directions[slot]
+            if self.downs[slot]:
+                pressed[direction] = True
+                self.held[direction] = True
+                presses.append(self.times[slot])
+            else:
+                self.held[direction] = False
+        self.read = self.written
+        if held is None:
+            held = InputState(*self.held)
+        controls = InputState(
+            left=held.left or pressed[0],
+            right=held.right or pressed[1],
+            up=held.up or pressed[2],
+            down=held.down or pressed[3],
+        )
+        return controls, presses
+
+
+class LatencyHistogram:
+    """Key-down to presented-frame latencies.
+
+    - samples: latencies kept for the percentiles
+    - clock: same time source as the InputBuffer
+    """
+
+    def __init__(self, samples=4096, clock=time.perf_counter):
+        self.clock = clock
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent = deque(maxlen=samples)
+        self.pending = []
+        # Frame pacing waits (ms) and the time of the last flip
+        self.pacing = deque(maxlen=samples)
+        self.last_presented = None
+
+    def ticked(self, presses):
+        """Key-downs (timestamps) applied by the tick just run."""
+        self.pending.extend(presses)
+
+    def frame_started(self, now=None):
+        """Start of update(): record the pacing wait since the last flip."""
+        if self.last_presented is None:
+            return
+        now = self.clock() if now is None else now
+        self.pacing.append((now - self.last_presented) * 1000)
+
+    def frame_presented(self, now=None):
+        """After the flip: the pending key-downs are on screen now."""
+        now = self.clock() if now is None else now
+        self.last_presented = now
+        if not self.pending:
+            return
+        for pressed_at in self.pending:
+            latency_ms = (now - pressed_at) * 1000
+            bucket = 0
+            while bucket < len(LATENCY_BUCKETS_MS) and latency_ms > LATENCY_BUCKETS_MS[bucket]:
+                bucket += 1
+            self.counts[bucket] += 1
+            self.recent.append(latency_ms)
+        self.pending = []
+
+    def percentile(self, share, samples=None):
+        """Latency (ms) below which `share` (0..1) of the recent samples fall.
+
+        - samples: other values to use instead (e.g. `pacing`)
+        """
+        samples = self.recent if samples is None else samples
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+    def reset(self):
+        """Start a new measurement."""
+        self.counts = [0] * len(self.counts)
+        self.recent.clear()
+        self.pacing.clear()
+        self.pending = []
+
+    def report(self):
+        """Text histogram, one line per bucket, with p50/p95/p99."""
+        total = sum(self.counts)
+        if not total:
+            return "no key presses measured"
+        lines = [
+            f"{total} key presses: p50 {self.percentile(0.5):.1f} ms, "
+            f"p95 {self.percentile(0.95):.1f} ms, p99 {self.percentile(0.99):.1f} ms"
+        ]
+        low = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + (None,), self.counts):
+            label = f"{low:>3}-{bound:<3} ms" if bound is not None else f"  >{low:<4} ms"
+            lines.append(f"{label} {count:6d} {'#' * round(40 * count / total)}")
+            low = bound
+        if self.pacing:
+            lines.append(
+                f"frame pacing wait (not included above): p50 {self.percentile(0.5, self.pacing):.1f} ms, "
+                f"p95 {self.percentile(0.95, self.pacing):.1f} ms"
+            )
+        return "\n".join(lines)
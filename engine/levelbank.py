@@ -0,0 +1,198 @@
+"""Pre-baked level library: fixed-size binary records read through mmap.
+
+The baker (tools/bake_levels.py) generates levels offline, validates them
+and writes them into one file; the game memory-maps the file and loads
+any level by index or by (level, seed) without parsing anything but the
+record it needs. The same file gives the same layouts on every machine,
+which makes benchmarks comparable.
+
+File layout (little-endian):
+- header: HEADER = magic, version, grid width, grid height,
+  max enemies, record size, record count
+- records sorted by (level, seed), each one RECORD:
+  level, seed, path length (spawn -> key -> door, in tiles),
+  wall bitmask (bit ty * GRID_WIDTH + tx), spawn/key/door tiles,
+  enemy count, then MAX_ENEMIES (type, tx, ty) triples
+"""
+
+import mmap
+import struct
+from collections import deque
+
+from .core import ENEMY_TYPES, GRID_HEIGHT, GRID_WIDTH, LevelLayout
+
+MAGIC = b"DLVL"
+VERSION = 1
+MAX_ENEMIES = 9
+MASK_BYTES = (GRID_WIDTH * GRID_HEIGHT + 7) // 8
+
+HEADER = struct.Struct("<4sHBBBHI")
+RECORD = struct.Struct(f"<BIH{MASK_BYTES}s7B{MAX_ENEMIES * 3}s")
+# Leading (level, seed) of a record, read alone while searching
+KEY = struct.Struct("<BI")
+
+
+def path_length(layout):
+    """Steps of the shortest walk spawn -> key -> door, or None if unreachable."""
+    def steps(start, goal):
+        seen = {start}
+        queue = deque([(start, 0)])
+        while queue:
+            (tx, ty), dist = queue.popleft()
+            if (tx, ty) == goal:
+                return dist
+            for nxt in ((tx + 1, ty), (tx - 1, ty), (tx, ty + 1), (tx, ty - 1)):
+                if (0 <= nxt[0] < GRID_WIDTH and 0 <= nxt[1] < GRID_HEIGHT
+                        and nxt not in layout.walls and nxt not in seen):
+                    seen.add(nxt)
+                    queue.append((nxt, dist + 1))
+        return None
+
+    to_key = steps(layout.player, layout.key)
+    to_door = steps(layout.key, layout.door) if to_key is not None else None
+    return None if to_door is None else to_key + to_door
+
+
+def check_layout(layout):
+    """Return the problems that make `layout` unplayable (empty if none).
+
+    Only what any level needs: entities on floor tiles of the grid, one
+    entity per tile, known enemy types, key and door reachable. The limits
+    of the bank format are checked by `validate()`.
+    """
+    problems = []
+    spots = [layout.player, layout.key, layout.door] + [(tx, ty) for _, tx, ty in layout.enemies]
+    for tx, ty in spots:
+        if not (0 <= tx < GRID_WIDTH and 0 <= ty < GRID_HEIGHT) or (tx, ty) in layout.walls:
+            problems.append(f"({tx}, {ty}) is not a floor tile")
+    if len(set(spots)) != len(spots):
+        problems.append("two entities share a tile")
+    if any(not 0 <= enemy_type < len(ENEMY_TYPES) for enemy_type, _, _ in layout.enemies):
+        problems.append("unknown enemy type")
+    if not problems and path_length(layout) is None:
+        problems.append("key or door unreachable from the spawn")
+    return problems
+
+
+def validate(layout):
+    """Return the problems that keep `layout` out of a bank (empty if none).
+
+    `check_layout()` plus the limits of a RECORD (at most MAX_ENEMIES enemies).
+    """
+    problems = check_layout(layout)
+    if len(layout.enemies) > MAX_ENEMIES:
+        problems.append(f"{len(layout.enemies)} enemies (max {MAX_ENEMIES} in a bank record)")
+    return problems
+
+
+def pack(layout, seed, path=0):
+    """Encode one layout as a RECORD."""
+    mask = 0
+    for tx, ty in layout.walls:
+        mask |= 1 << (ty * GRID_WIDTH + tx)
+    enemies = bytes(value for enemy in layout.enemies for value in enemy)
+    return RECORD.pack(
+        layout.level, seed, path, mask.to_bytes(MASK_BYTES, "little"),
+        *layout.player, *layout.key, *layout.door, len(layout.enemies), enemies,
+    )
+
+
+def write_header(f, count):
+    """Write the header of a bank of `count` records at the start of file `f`."""
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, GRID_WIDTH, GRID_HEIGHT, MAX_ENEMIES, RECORD.size, count))
+
+
+def write_bank(path, records):
+    """Write a bank file from (level, seed, packed record) tuples, sorted by key."""
+    records = sorted(records)
+    with open(path, "wb") as f:
+        write_header(f, len(records))
+        for _, _, record in records:
+            f.write(record)
+
+
+class LevelBank:
+    """Read-only, memory-mapped level library.
+
+    Assign it to `World.level_bank` to have `generate_level()` pick a
+    random baked layout of the requested level instead of generating one.
+
+    - path: bank file written by tools/bake_levels.py
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, height, max_enemies, record_size, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a level bank (version {VERSION})")
+        if (width, height, max_enemies, record_size) != (GRID_WIDTH, GRID_HEIGHT, MAX_ENEMIES, RECORD.size):
+            raise ValueError(f"{path}: baked for a different grid or record size")
+        if len(self._map) < HEADER.size + count * RECORD.size:
+            raise ValueError(f"{path}: truncated")
+        self.count = count
+        self._ranges = {}
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._map.close()
+
+    def key(self, index):
+        """(level, seed) of record `index`."""
+        return KEY.unpack_from(self._map, HEADER.size + index * RECORD.size)
+
+    def _bisect(self, key):
+        """First record index whose (level, seed) is not below `key`."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def level_range(self, level):
+        """(first, end) record indexes of `level`."""
+        span = self._ranges.get(level)
+        if span is None:
+            span = self._ranges[level] = (self._bisect((level, 0)), self._bisect((level + 1, 0)))
+        return span
+
+    def layout(self, index):
+        """Decode record `index` into a LevelLayout."""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        (level, _seed, _path, mask, px, py, kx, ky, dx, dy,
+         enemy_count, enemies) = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+        bits = int.from_bytes(mask, "little")
+        walls = set()
+        while bits:
+            low = bits & -bits
+            bit = low.bit_length() - 1
+            walls.add((bit % GRID_WIDTH, bit // GRID_WIDTH))
+            bits ^= low
+        enemies = [tuple(enemies[i:i + 3]) for i in range(0, enemy_count * 3, 3)]
+        return LevelLayout(level, walls, (px, py), (kx, ky), (dx, dy), enemies)
+
+    def path_length(self, index):
+        """Baked spawn -> key -> door path length of record `index`, in tiles."""
+        return struct.unpack_from("<H", self._map, HEADER.size + index * RECORD.size + KEY.size)[0]
+
+    def find(self, level, seed):
+        """Layout baked for (level, seed), or None if the bank does not have it."""
+        index = self._bisect((level, seed))
+        if index < self.count and self.key(index) == (level, seed):
+            return self.layout(index)
+        return None
+
+    def pick(self, level, rng):
+        """Random layout of `level` drawn with `rng`, or None if there is none."""
+        first, end = self.level_range(level)
+        if first == end:
+            return None
+        return self.layout(rng.randrange(first, end))
+
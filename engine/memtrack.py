@@ -0,0 +1,169 @@
+"""Allocation and leak tracking across level transitions (tracemalloc).
+
+`MemoryTracker` takes a sample at every level transition (the world's
+"level_completed" and "game_over" events, i.e. next_level() and
+game_over()): traced memory from tracemalloc plus the number of live
+objects of the tracked types, counted through the garbage collector.
+Comparing samples shows what grows between transitions; `leaks()` is the
+check a headless run can fail on (see tools/leak_check.py). Allocations
+made by the tracker itself (its samples) are left out of the traced
+memory, otherwise a long run would always look like a leak.
+
+The tracker's own memory stays bounded however long the game runs: only
+the last `history` samples are kept, plus, per label, the first sample
+after the warm-up (the baseline) and the latest one. Leak checks only
+need those two, and the largest traced growth is updated as samples come in.
+"""
+
+import gc
+import tracemalloc
+
+from collections import Counter, deque
+
+# Type names counted by default: the engine's per-level objects and the
+# PgZero Actors the front-end attaches to them. Instances of subclasses are
+# counted under every tracked base (a SlimeFire counts as an Enemy), so the
+# totals do not depend on the random enemy mix of a level.
+TRACKED_TYPES = ("Rect", "Animation", "Player", "Enemy", "Actor")
+
+
+class MemorySample:
+    """Memory state at one level transition."""
+
+    def __init__(self, label, counts, traced, peak, snapshot):
+        self.label = label
+        self.counts = counts
+        self.traced = traced
+        self.peak = peak
+        self.snapshot = snapshot
+
+    def __repr__(self):
+        counts = " ".join(f"{name}={count}" for name, count in sorted(self.counts.items()))
+        return f"<{self.label}: {self.traced / 1024:.1f} KiB traced, {counts}>"
+
+
+class MemoryTracker:
+    """Take memory samples at level transitions and report their growth.
+
+    - types: names of the types whose live instances are counted
+    - frames: traceback depth stored by tracemalloc for each allocation
+    - keep_snapshots: keep the tracemalloc snapshot of the last two samples,
+      needed for the allocation sites in `report()` (costs memory and time)
+    - history: recent samples kept in `samples`
+    - warmup: samples taken before the baselines of `leaks()` (caches and
+      lazily created objects settle during the first transitions)
+    """
+
+    def __init__(self, types=TRACKED_TYPES, frames=1, keep_snapshots=True, history=64, warmup=0):
+        self.types = frozenset(types)
+        self.frames = frames
+        self.keep_snapshots = keep_snapshots
+        self.warmup = warmup
+        self.samples = deque(maxlen=history)
+        self.taken = 0
+        # {label: sample}: first sample after the warm-up, and latest sample
+        self.baselines = {}
+        self.latest = {}
+        # Largest traced-memory growth over the baseline of the same label
+        self.traced_growth = 0
+        self._started_tracing = False
+
+    def start(self):
+        """Start tracemalloc (if it is not already tracing)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self):
+        """Stop tracemalloc if this tracker started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def count_objects(self):
+        """Return {type name: live instances} for the tracked types."""
+        counts = dict.fromkeys(self.types, 0)
+        for cls, count in Counter(map(type, gc.get_objects())).items():
+            for base in cls.__mro__:
+                if base.__name__ in counts:
+                    counts[base.__name__] += count
+        return counts
+
+    def sample(self, label):
+        """Collect garbage, then record counts and traced memory."""
+        gc.collect()
+        counts = self.count_objects()
+        traced, peak = tracemalloc.get_traced_memory()
+        snapshot = None
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            own = (tracemalloc.__file__, __file__)
+            traced = sum(
+                stat.size for stat in snapshot.statistics("filename")
+                if stat.traceback[0].filename not in own
+            )
+            if not self.keep_snapshots:
+                snapshot = None
+            else:
+                snapshot = snapshot.filter_traces((
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                ))
+                # Only the last two snapshots are ever compared
+                if len(self.samples) >= 2:
+                    self.samples[-2].snapshot = None
+        sample = MemorySample(label, counts, traced, peak, snapshot)
+        self.samples.append(sample)
+        self.taken += 1
+        if self.taken > self.warmup:
+            baseline = self.baselines.setdefault(label, sample)
+            self.latest[label] = sample
+            self.traced_growth = max(self.traced_growth, traced - baseline.traced)
+        return sample
+
+    def observe(self, name, data):
+        """Sample at the world's level transitions; return the new sample."""
+        if name == "level_completed":
+            return self.sample(f"level {data['level']} completed")
+        if name == "game_over":
+            return self.sample(f"game over at level {data['level']}")
+        return None
+
+    def growth(self, first=-2, last=-1):
+        """Per-type count change and traced bytes change between two samples."""
+        a = self.samples[first]
+        b = self.samples[last]
+        counts = {name: b.counts[name] - a.counts[name] for name in self.types}
+        return counts, b.traced - a.traced
+
+    def leaks(self, tolerance=0):
+        """Types whose live count grew by more than `tolerance` after the warm-up.
+
+        Samples are only compared with samples of the same label (same
+        level, same outcome), since every level holds a different number of
+        walls and enemies: the latest one against the baseline.
+        """
+        leaks = {}
+        for label, sample in self.latest.items():
+            for name in self.types:
+                delta = sample.counts[name] - self.baselines[label].counts[name]
+                if delta > tolerance:
+                    leaks[name] = max(leaks.get(name, 0), delta)
+        return leaks
+
+    def report(self, top=5):
+        """Text report of the last transition: counts, growth, allocation sites."""
+        if not self.samples:
+            return "no memory samples"
+        last = self.samples[-1]
+        lines = [repr(last)]
+        if len(self.samples) >= 2:
+            counts, traced = self.growth()
+            changed = ", ".join(f"{name} {delta:+d}" for name, delta in sorted(counts.items()) if delta)
+            lines.append(f"  since previous: {traced / 1024:+.1f} KiB, {changed or 'no count changes'}")
+            previous = self.samples[-2]
+            if top and last.snapshot and previous.snapshot:
+                for stat in last.snapshot.compare_to(previous.snapshot, "lineno")[:top]:
+                    lines.append(f"  {stat}")
+        return "\n".join(lines)
@@ -0,0 +1,139 @@
+"""On-demand cProfile capture of a fixed number of frames.
+
+`ProfileCapture.start()` only arms the capture; the front-end brackets
+each frame with `begin_frame()` (start of update) and `end_frame()` (end
+of draw), so exactly update() and draw() are profiled, not the time
+PgZero spends waiting for the next frame. While no capture is running no
+profiler is installed: the only cost is the `active` check per frame.
+
+When the frames are done three files are written, named after the level,
+the number of enemies, the game state and the quality tier (when the
+front-end passes one) at the moment of the capture:
+- `<tag>.pstats`: for `python -m pstats`, snakeviz and the like
+- `<tag>.collapsed`: "a;b;c <microseconds>" lines for flamegraph.pl or
+  speedscope. cProfile only keeps caller -> callee edges, so the stacks are
+  rebuilt from them and a function called from several places splits its
+  time in proportion to each caller's share.
+- `<tag>.json`: the capture context (level, enemies, state, frames) and the
+  quality status (e.g. `QualityGovernor.status()`: tier, frame_ms) at the
+  start and at the end, since the tier may change during the capture
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import time
+
+
+def label(func):
+    """Readable name of a pstats function key (file, line, name)."""
+    filename, line, name = func
+    if filename == "~":
+        return name.strip("<>")
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(stats, max_depth=64):
+    """Return {stack tuple: microseconds} rebuilt from a pstats.Stats."""
+    entries = stats.stats
+    callees = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks = {}
+
+    def visit(func, stack, share):
+        _cc, _nc, tt, ct, _callers = entries[func]
+        stack = stack + (label(func),)
+        weight = int(tt * share * 1e6)
+        if weight:
+            stacks[stack] = stacks.get(stack, 0) + weight
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            callee_ct = entries[callee][3]
+            if callee_ct <= 0 or label(callee) in stack:
+                continue
+            visit(callee, stack, share * edge_ct / callee_ct)
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    for root in roots:
+        visit(root, (), 1.0)
+    return stacks
+
+
+class ProfileCapture:
+    """Profile update() and draw() for `frames` frames, then dump the results.
+
+    - out_dir: folder for the .pstats and .collapsed files
+    - frames: frames captured per start()
+    """
+
+    def __init__(self, out_dir="profiles", frames=300):
+        self.out_dir = out_dir
+        self.frames = frames
+        self.active = False
+        self.profiler = None
+        self.frames_left = 0
+        self.tag = ""
+        self.context = {}
+        self.last_files = None
+
+    def start(self, level, enemies, state, quality=None):
+        """Arm a capture; it begins with the next frame. Ignored if one is running.
+
+        - quality: status of the quality governor (a dict with "tier"), or None
+        """
+        if self.active:
+            return False
+        self.tag = f"profile-{time.strftime('%Y%m%d-%H%M%S')}-L{level}-E{enemies}-{state}"
+        if quality is not None:
+            self.tag += f"-T{quality['tier']}"
+        self.context = {
+            "level": level,
+            "enemies": enemies,
+            "state": state,
+            "frames": self.frames,
+            "quality_start": quality,
+        }
+        self.profiler = cProfile.Profile()
+        self.frames_left = self.frames
+        self.active = True
+        return True
+
+    def begin_frame(self):
+        """Start of update(): resume profiling."""
+        self.profiler.enable()
+
+    def end_frame(self, quality=None):
+        """End of draw(): pause profiling; write the files after the last frame.
+
+        - quality: current governor status, stored as the end status
+
+        Return the (pstats, collapsed, json) paths when the capture just finished.
+        """
+        self.profiler.disable()
+        self.frames_left -= 1
+        if self.frames_left > 0:
+            return None
+        self.active = False
+        self.context["quality_end"] = quality
+        files = self.write()
+        self.profiler = None
+        return files
+
+    def write(self):
+        """Dump the current profile as .pstats and .collapsed files, plus the context."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, self.tag)
+        stats = pstats.Stats(self.profiler)
+        stats.dump_stats(base + ".pstats")
+        with open(base + ".collapsed", "w") as f:
+            for stack, weight in sorted(collapsed_stacks(stats).items()):
+                f.write(";".join(stack) + f" {weight}\n")
+        with open(base + ".json", "w") as f:
+            json.dump(self.context, f, indent=2)
+        self.last_files = (base + ".pstats", base + ".collapsed", base + ".json")
+        return self.last_files
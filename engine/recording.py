@@ -0,0 +1,99 @@
+"""Per-tick position recordings of player and enemies.
+
+`PositionRecorder` appends one fixed-size record per entity per tick to a
+`.pos` file: layout id, kind (0 = player, 1 + index in ENEMY_TYPES for
+enemies) and pixel position. Every level loaded during the recording gets
+a layout id; the layouts themselves (walls, spawn, key, door, enemies) are
+stored next to the recording as a level bank (`<name>.layouts`, see
+engine/levelbank.py) whose seed field is the layout id. Each layout is
+appended to the bank as soon as its level is loaded, before any tick that
+refers to it, so the files of a session that crashed can still be read by
+index (as tools/heatmap.py does); close() rewrites the bank sorted by
+(level, layout id), which `LevelBank.find()` and `pick()` need.
+Fixed-size records let analysis tools read the file as one array in large
+slices (tools/heatmap.py).
+
+A layout that does not fit a bank record (more than levelbank.MAX_ENEMIES
+enemies, e.g. an authored map) is rejected with ValueError and its ticks
+are not recorded.
+"""
+
+import struct
+
+from .core import ENEMY_TYPES, LevelLayout
+from .levelbank import pack, validate, write_bank, write_header
+
+MAGIC = b"DPOS"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<IBxhh")
+KIND_PLAYER = 0
+
+
+def layouts_path(path):
+    """Path of the layout bank that goes with recording `path`."""
+    return str(path)[: -len(".pos")] + ".layouts" if str(path).endswith(".pos") else str(path) + ".layouts"
+
+
+class PositionRecorder:
+    """Record player and enemy positions tick by tick.
+
+    - path: output `.pos` file
+    - buffer_size: bytes kept in memory between writes
+    """
+
+    def __init__(self, path, buffer_size=1 << 16):
+        self.path = str(path)
+        self.layout_id = -1
+        self.layouts = []
+        self.ticks = 0
+        self.skipping = False
+        self._kinds = {cls: index + 1 for index, cls in enumerate(ENEMY_TYPES)}
+        self._file = open(self.path, "wb", buffering=buffer_size)
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._bank = open(layouts_path(self.path), "wb")
+        write_header(self._bank, 0)
+
+    def level_loaded(self, world):
+        """Start a new layout: call on the world's "level_generated" event.
+
+        Raise ValueError if the layout cannot be stored; the ticks of that
+        level are then skipped until the next level is loaded.
+        """
+        layout = LevelLayout.from_world(world)
+        problems = validate(layout)
+        if problems:
+            self.skipping = True
+            raise ValueError(f"level {layout.level} not recorded: " + "; ".join(problems))
+        self.skipping = False
+        self.layout_id += 1
+        record = pack(layout, self.layout_id)
+        self.layouts.append((layout.level, self.layout_id, record))
+        # Append the record, then count it in the header
+        self._bank.seek(0, 2)
+        self._bank.write(record)
+        write_header(self._bank, len(self.layouts))
+        self._bank.flush()
+
+    def record(self, world):
+        """Append the positions of the current tick."""
+        if self.skipping:
+            return
+        if self.layout_id < 0:
+            self.level_loaded(world)
+        layout_id = self.layout_id
+        player = world.player
+        chunks = [RECORD.pack(layout_id, KIND_PLAYER, int(player.x), int(player.y))]
+        kinds = self._kinds
+        for enemy in world.enemies:
+            chunks.append(RECORD.pack(layout_id, kinds[type(enemy)], int(enemy.x), int(enemy.y)))
+        self._file.write(b"".join(chunks))
+        self.ticks += 1
+
+    def close(self):
+        """Flush the recording and write its layouts sorted."""
+        if self._file.closed:
+            return
+        self._file.close()
+        self._bank.close()
+        write_bank(layouts_path(self.path), self.layouts)
@@ -0,0 +1,80 @@
+"""Rendering bookkeeping shared by the front-ends (pure Python).
+
+Nothing here draws: these helpers only decide *what* has to be drawn, so
+the PgZero front-end can skip work that would repaint identical pixels.
+"""
+
+from math import ceil, floor
+
+from .core import Rect
+
+
+def snap_rect(rect):
+    """Round a rectangle outwards to whole pixels."""
+    x = floor(rect.x)
+    y = floor(rect.y)
+    return Rect(x, y, ceil(rect.x + rect.width) - x, ceil(rect.y + rect.height) - y)
+
+
+def bounds_of(sprite):
+    """Bounds of any sprite exposing left/top/width/height (e.g. a PgZero Actor)."""
+    return Rect(sprite.left, sprite.top, sprite.width, sprite.height)
+
+
+class DirtyRectTracker:
+    """Track sprite bounds between frames and report the regions to repaint.
+
+    Each frame the caller passes the current bounds of every sprite, keyed
+    by any hashable id. A sprite's region is dirty in its previous and in
+    its current position (sprites animate, so a sprite standing still is
+    still repainted); a sprite that disappeared leaves its previous region
+    dirty. After `invalidate()` the next frame must be a full redraw.
+
+    - width, height: size of the drawing surface (dirty rects are clipped to it)
+    """
+
+    def __init__(self, width, height):
+        self.screen_rect = Rect(0, 0, width, height)
+        self.previous = {}
+        self.dirty_rects = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Force a full redraw on the next frame (state or level changed)."""
+        self.full_redraw = True
+
+    def commit_full(self, bounds):
+        """Record the sprite bounds after the caller repainted everything."""
+        self.full_redraw = False
+        self.previous = {key: snap_rect(rect) for key, rect in bounds.items()}
+        self.dirty_rects = [self.screen_rect]
+
+    def update(self, bounds):
+        """Return the list of rectangles to repaint for this frame."""
+        current = {key: snap_rect(rect) for key, rect in bounds.items()}
+        dirty = []
+        for key, rect in current.items():
+            prev = self.previous.get(key)
+            if prev is None:
+                dirty.append(rect)
+            elif prev.colliderect(rect):
+                dirty.append(prev.union(rect))
+            else:
+                dirty.append(prev)
+                dirty.append(rect)
+        for key, prev in self.previous.items():
+            if key not in current:
+                dirty.append(prev)
+
+        self.previous = current
+        self.dirty_rects = []
+        for rect in dirty:
+            self.add(rect)
+        return self.dirty_rects
+
+    def add(self, rect):
+        """Mark an extra region (e.g. the HUD) as dirty for this frame."""
+        rect = snap_rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.dirty_rects.append(rect)
+        return rect
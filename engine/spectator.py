@@ -0,0 +1,254 @@
+"""Live spectator stream: per-tick state deltas fanned out to many viewers.
+
+The game calls `SpectatorServer.publish(world)` once per tick. The world is
+reduced to a compact snapshot, diffed against the previous one and the
+delta is encoded once (one JSON line); the asyncio loop then copies the
+same bytes into every connected viewer's queue.
+
+The server loop runs in a background thread, so `publish()` never waits
+on the network. Each viewer has a bounded queue: when a slow viewer falls
+behind, its backlog is dropped and it is resynced with a keyframe (a full
+snapshot) instead of stalling the game or the other viewers.
+
+Wire format (newline-delimited JSON, positions in whole pixels):
+- keyframe: {"n": tick, "k": 1, "st": ..., "lv": ..., "key": ..., "p": [x, y, hp],
+             "e": [[kind, x, y], ...], "w": [[tx, ty], ...], "kp": [x, y], "dp": [x, y]}
+- delta:    {"n": tick, <only the fields that changed>}; moved enemies are
+            sent as "em": [[index, x, y], ...] while the enemy kinds are unchanged
+- kind is the index of the enemy class in ENEMY_TYPES
+"""
+
+import asyncio
+import json
+import socket
+import threading
+
+from .core import ENEMY_TYPES, GRID_HEIGHT, GRID_WIDTH, TILE_SIZE
+
+
+def snapshot(world):
+    """Return the compact, JSON-ready view of the world sent to viewers."""
+    player = world.player
+    snap = {
+        "st": world.state,
+        "lv": world.current_level,
+        "key": world.key_collected,
+        "p": [round(player.x), round(player.y), player.health] if player else None,
+        "e": [
+            [ENEMY_TYPES.index(type(enemy)), round(enemy.x), round(enemy.y)]
+            for enemy in world.enemies
+        ],
+        # Internal walls only: the border is always the same
+        "w": [
+            [int(wall.x) // TILE_SIZE, int(wall.y) // TILE_SIZE]
+            for wall in world.walls
+            if 0 < wall.x < (GRID_WIDTH - 1) * TILE_SIZE and 0 < wall.y < (GRID_HEIGHT - 1) * TILE_SIZE
+        ],
+        "kp": list(world.key_position) if world.key_position else None,
+        "dp": list(world.door_position) if world.door_position else None,
+    }
+    return snap
+
+
+def diff(previous, current):
+    """Return the fields of `current` that differ from `previous`."""
+    delta = {}
+    for field, value in current.items():
+        old = previous.get(field)
+        if value == old:
+            continue
+        if field == "e" and old and [e[0] for e in old] == [e[0] for e in value]:
+            delta["em"] = [
+                [i, enemy[1], enemy[2]]
+                for i, (enemy, old_enemy) in enumerate(zip(value, old))
+                if enemy != old_enemy
+            ]
+        else:
+            delta[field] = value
+    return delta
+
+
+def encode(message):
+    """Encode one message as a compact JSON line."""
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+def apply_message(state, message):
+    """Apply a keyframe or delta to a viewer-side state dict (in place).
+
+    Only `state` itself is modified: field values are replaced, never
+    changed in place, so a shallow copy of `state` stays a consistent
+    snapshot that another thread can read.
+    """
+    if message.get("k"):
+        state.clear()
+    for field, value in message.items():
+        if field == "em":
+            enemies = [list(enemy) for enemy in state.get("e", [])]
+            for index, x, y in value:
+                enemies[index][1] = x
+                enemies[index][2] = y
+            state["e"] = enemies
+        elif field != "k":
+            state[field] = value
+    return state
+
+
+class _Viewer:
+    """Server-side record of one connected viewer."""
+
+    __slots__ = ("writer", "task", "queue", "needs_keyframe", "sent", "dropped")
+
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.task = asyncio.current_task()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.needs_keyframe = True
+        self.sent = 0
+        self.dropped = 0
+
+
+class SpectatorServer:
+    """Asyncio TCP server that streams world deltas to spectators.
+
+    - host, port: where to listen (port 0 picks a free port, see `port`)
+    - queue_size: messages buffered per viewer before it gets resynced
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, queue_size=64):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.tick = 0
+        self.viewers = set()
+        self.loop = None
+        self._server = None
+        self._thread = None
+        self._last = {}
+
+    async def start(self):
+        """Start listening on the running loop (use from asyncio code)."""
+        self.loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Disconnect every viewer and stop listening."""
+        self._server.close()
+        viewers = list(self.viewers)
+        for viewer in viewers:
+            # abort(): do not wait for slow viewers to read what is buffered
+            viewer.writer.transport.abort()
+        await asyncio.gather(*(viewer.task for viewer in viewers), return_exceptions=True)
+        await self._server.wait_closed()
+
+    def start_in_thread(self):
+        """Run the server loop in a daemon thread (use from the game loop)."""
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.start())
+            ready.set()
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="spectator", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self):
+        """Stop a server started with `start_in_thread()`."""
+        loop = self.loop
+        future = asyncio.run_coroutine_threadsafe(self.close(), loop)
+        future.result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+
+    def publish(self, world):
+        """Diff the world against the last tick and queue the delta for fan-out.
+
+        Safe to call from any thread; it never blocks on viewers.
+        """
+        self.tick += 1
+        current = snapshot(world)
+        delta = diff(self._last, current)
+        self._last = current
+        payload = None
+        if delta:
+            delta["n"] = self.tick
+            payload = encode(delta)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._fan_out, self.tick, current, payload)
+        return payload
+
+    def _fan_out(self, tick, current, payload):
+        """Copy the encoded delta into every viewer queue (loop thread)."""
+        keyframe = None
+        for viewer in self.viewers:
+            queue = viewer.queue
+            if queue.full():
+                # Slow viewer: drop its backlog and resync with a keyframe
+                while not queue.empty():
+                    queue.get_nowait()
+                    viewer.dropped += 1
+                viewer.needs_keyframe = True
+            if viewer.needs_keyframe:
+                if keyframe is None:
+                    keyframe = encode(dict(current, n=tick, k=1))
+                queue.put_nowait(keyframe)
+                viewer.needs_keyframe = False
+            elif payload is not None:
+                queue.put_nowait(payload)
+
+    async def _pump(self, viewer):
+        """Write queued messages to one viewer at its own pace."""
+        try:
+            while True:
+                message = await viewer.queue.get()
+                viewer.writer.write(message)
+                await viewer.writer.drain()
+                viewer.sent += 1
+        except ConnectionError:
+            pass
+
+    async def _handle(self, reader, writer):
+        """Serve one viewer until it disconnects."""
+        # Keep buffering in our queue, where slow viewers can be resynced,
+        # rather than in the transport and kernel buffers
+        buffer_size = self.queue_size * 64
+        writer.transport.set_write_buffer_limits(high=buffer_size)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+        viewer = _Viewer(writer, self.queue_size)
+        self.viewers.add(viewer)
+        pump = asyncio.create_task(self._pump(viewer))
+        # Viewers never send anything: reading only detects the disconnection
+        reading = asyncio.create_task(reader.read())
+        try:
+            await asyncio.wait({pump, reading}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.viewers.discard(viewer)
+            pump.cancel()
+            reading.cancel()
+            writer.close()
+
+
+async def watch(host, port, on_state, state=None):
+    """Connect to a spectator server and call `on_state(state)` per message.
+
+    `state` is the viewer-side dict kept up to date with `apply_message`.
+    Returns when the server closes the connection.
+    """
+    if state is None:
+        state = {}
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            on_state(apply_message(state, json.loads(line)))
+    finally:
+        writer.close()
+    return state
@@ -0,0 +1,150 @@
+"""Run telemetry: per-level records written in batches by a background thread.
+
+`Telemetry.observe(name, data)` turns the world events into records
+(level start with the enemy mix, hits, level end with time and damage
+taken, deaths with position). `record()` only appends to an in-memory
+buffer; a writer thread flushes the buffer to the session file when it
+holds `batch_size` records or every `flush_interval` seconds, so gameplay
+frames never wait on file I/O.
+
+The file format follows the extension: `.jsonl` (one JSON object per line)
+or `.csv` (columns in FIELDS, the enemy mix as "SlimeNormal:2;SlimeFire:1").
+"""
+
+import csv
+import json
+import threading
+
+# Columns of a telemetry record (missing values are left empty in CSV)
+FIELDS = ("session", "run", "event", "level", "time", "damage", "health", "x", "y", "outcome", "enemies")
+
+
+def format_enemies(enemies):
+    """Encode an enemy mix {type: count} for a CSV cell."""
+    return ";".join(f"{name}:{count}" for name, count in sorted(enemies.items()))
+
+
+def parse_enemies(text):
+    """Decode a CSV enemy mix cell back into {type: count}."""
+    enemies = {}
+    for item in filter(None, text.split(";")):
+        name, count = item.split(":")
+        enemies[name] = int(count)
+    return enemies
+
+
+def read_records(path):
+    """Yield the records of one session file (JSONL or CSV), one at a time."""
+    with open(path, newline="") as f:
+        if str(path).endswith(".csv"):
+            for row in csv.DictReader(f):
+                record = {key: value for key, value in row.items() if value != ""}
+                for key in ("run", "level", "damage", "health"):
+                    if key in record:
+                        record[key] = int(record[key])
+                for key in ("time", "x", "y"):
+                    if key in record:
+                        record[key] = float(record[key])
+                if "enemies" in record:
+                    record["enemies"] = parse_enemies(record["enemies"])
+                yield record
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class Telemetry:
+    """Buffered telemetry writer for one session (one launch of the game).
+
+    - path: output file; `.csv` for CSV, anything else is JSONL
+    - session: identifier stored in every record
+    - batch_size: buffered records that wake the writer early
+    - flush_interval: seconds between flushes of a partial batch
+    """
+
+    def __init__(self, path, session="", batch_size=256, flush_interval=2.0):
+        self.path = str(path)
+        self.session = session
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.csv = self.path.endswith(".csv")
+        self.run = 0
+        self.level = None
+        self.damage = 0
+        self.written = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closing = False
+        self._writer = threading.Thread(target=self._write_loop, name="telemetry", daemon=True)
+        self._writer.start()
+
+    def record(self, event, **fields):
+        """Queue one record; never touches the file."""
+        fields["session"] = self.session
+        fields["run"] = self.run
+        fields["event"] = event
+        with self._lock:
+            self._buffer.append(fields)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def observe(self, name, data):
+        """Turn one world event into telemetry records."""
+        if name == "game_started":
+            self.run += 1
+        elif name == "level_generated":
+            self.level = data["level"]
+            self.damage = 0
+            enemies = {}
+            for enemy_type in data["enemy_types"]:
+                enemies[enemy_type] = enemies.get(enemy_type, 0) + 1
+            self.record("level_start", level=data["level"], enemies=enemies)
+        elif name == "hit":
+            self.damage += 1
+            self.record("hit", level=self.level, health=data["health"], x=round(data["x"]), y=round(data["y"]))
+        elif name == "level_completed":
+            self.record("level_end", level=data["level"], time=round(data["time"], 3),
+                        damage=self.damage, outcome="completed")
+        elif name == "game_over":
+            x, y = round(data["x"]), round(data["y"])
+            self.record("death", level=data["level"], time=round(data["time"], 3), x=x, y=y)
+            self.record("level_end", level=data["level"], time=round(data["time"], 3),
+                        damage=self.damage, outcome="death")
+        elif name == "quit":
+            self.record("level_end", level=data["level"], time=round(data["time"], 3),
+                        damage=self.damage, outcome="quit")
+
+    def close(self):
+        """Flush what is left and stop the writer thread."""
+        self._closing = True
+        self._wake.set()
+        self._writer.join()
+
+    def _write_loop(self):
+        """Writer thread: flush full batches at once, partial ones periodically."""
+        with open(self.path, "a", newline="") as f:
+            writer = None
+            if self.csv:
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                if f.tell() == 0:
+                    writer.writeheader()
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                with self._lock:
+                    batch, self._buffer = self._buffer, []
+                if batch:
+                    if writer:
+                        for record in batch:
+                            if "enemies" in record:
+                                record["enemies"] = format_enemies(record["enemies"])
+                        writer.writerows(batch)
+                    else:
+                        f.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in batch))
+                    f.flush()
+                    self.written += len(batch)
+                if self._closing and not self._buffer:
+                    return
@@ -0,0 +1,125 @@
+"""Hand-authored levels in a plain-text tile-map format.
+
+One character per tile, one line per row, GRID_WIDTH x GRID_HEIGHT:
+
+    ; comment lines start with ';'
+    ####################
+    #P.....#....n......#
+    #......#...........#
+    ...
+    #..........K.....D.#
+    ####################
+
+Legend: `#` wall, `.` floor, `P` player spawn, `K` key, `D` door and one
+letter per enemy spawn (the tile under an entity is floor):
+`n` SlimeNormal, `f` SlimeFire, `b` SlimeBlock, `s` SlimeSpike.
+
+`parse_map()` reads the text into a LevelLayout in a single pass over the
+rows: walls and entities are found by regular-expression scans in C and
+floor tiles are never visited in Python, so the cost grows with the walls
+and entities, not with the map area. Load the result
+with `World.load_layout()`, or list it in `World.authored_levels` to use it
+for a given level number.
+
+`parse_map(text, size=None)` accepts a map of any size (e.g. for
+benchmarks), but only GRID_WIDTH x GRID_HEIGHT maps can be played:
+`World.load_layout()` places everything on the fixed game grid, so
+`load_map()` rejects any other size. The number of enemies is not limited,
+unlike in a level bank (see levelbank.MAX_ENEMIES).
+"""
+
+import os
+import re
+
+from .core import ENEMY_TYPES, GRID_HEIGHT, GRID_WIDTH, LevelLayout
+from .levelbank import check_layout
+
+# levels/ in the project folder (next to main.py)
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels")
+
+WALL = "#"
+FLOOR = "."
+PLAYER = "P"
+KEY = "K"
+DOOR = "D"
+# Enemy letters in ENEMY_TYPES order
+ENEMY_LETTERS = "nfbs"
+if len(ENEMY_LETTERS) != len(ENEMY_TYPES):
+    raise ValueError(
+        f"tilemap.ENEMY_LETTERS has {len(ENEMY_LETTERS)} letters for "
+        f"{len(ENEMY_TYPES)} enemy types: add a letter for every type in ENEMY_TYPES"
+    )
+
+_WALL = re.compile("#")
+_ENTITY = re.compile(r"[^.#]")
+
+
+def parse_map(text, size=(GRID_WIDTH, GRID_HEIGHT), level=0, name="map"):
+    """Parse a tile map into a LevelLayout.
+
+    - text: the map
+    - size: required (width, height), or None to accept any rectangular map
+    - level: level number stored in the layout
+    - name: used in error messages
+
+    Raise ValueError on a malformed map.
+    """
+    rows = [line.rstrip("\r") for line in text.splitlines() if line.strip() and not line.startswith(";")]
+    if not rows:
+        raise ValueError(f"{name}: empty map")
+    width = len(rows[0])
+    for ty, row in enumerate(rows):
+        if len(row) != width:
+            raise ValueError(f"{name}: row {ty + 1} is {len(row)} tiles wide, expected {width}")
+    if size is not None and (width, len(rows)) != tuple(size):
+        raise ValueError(f"{name}: map is {width}x{len(rows)}, expected {size[0]}x{size[1]}")
+
+    walls = set()
+    spots = {}
+    enemies = []
+    for ty, row in enumerate(rows):
+        walls.update([(match.start(), ty) for match in _WALL.finditer(row)])
+        for match in _ENTITY.finditer(row):
+            tile = (match.start(), ty)
+            char = match.group()
+            if char in ENEMY_LETTERS:
+                enemies.append((ENEMY_LETTERS.index(char),) + tile)
+            elif char in (PLAYER, KEY, DOOR):
+                if char in spots:
+                    raise ValueError(f"{name}: more than one '{char}' (row {ty + 1})")
+                spots[char] = tile
+            else:
+                raise ValueError(f"{name}: unknown tile '{char}' at row {ty + 1}, column {tile[0] + 1}")
+
+    missing = [char for char in (PLAYER, KEY, DOOR) if char not in spots]
+    if missing:
+        raise ValueError(f"{name}: missing {', '.join(repr(char) for char in missing)}")
+    return LevelLayout(level, walls, spots[PLAYER], spots[KEY], spots[DOOR], enemies)
+
+
+def load_map(path, level=0):
+    """Read a map file for the game and check it is playable.
+
+    Relative paths are looked up in LEVELS_DIR. Raise ValueError on a
+    malformed map, one that is not GRID_WIDTH x GRID_HEIGHT, or one whose
+    key or door cannot be reached.
+    """
+    path = os.path.join(LEVELS_DIR, path)
+    with open(path, encoding="utf-8") as f:
+        layout = parse_map(f.read(), level=level, name=path)
+    problems = check_layout(layout)
+    if problems:
+        raise ValueError(f"{path}: " + "; ".join(problems))
+    return layout
+
+
+def format_map(layout, width=GRID_WIDTH, height=GRID_HEIGHT):
+    """Write a LevelLayout as map text (e.g. a generated level to start from)."""
+    grid = [[FLOOR] * width for _ in range(height)]
+    for tx, ty in layout.walls:
+        grid[ty][tx] = WALL
+    for enemy_type, tx, ty in layout.enemies:
+        grid[ty][tx] = ENEMY_LETTERS[enemy_type]
+    for char, (tx, ty) in ((PLAYER, layout.player), (KEY, layout.key), (DOOR, layout.door)):
+        grid[ty][tx] = char
+    return "\n".join("".join(row) for row in grid) + "\n"
@@ -0,0 +1,196 @@
+"""Balance numbers in a JSON data file, reloaded while the game runs.
+
+`TuningWatcher.poll()` is cheap enough for every frame: it only calls
+os.stat() once every `interval` seconds, reads the file when its mtime or
+size changed and re-parses it only when the content hash changed too.
+A file that fails validation is reported and ignored, so a typo never
+stops the game: the previous numbers stay in place.
+
+Example file (every section is optional and missing values keep the
+defaults; a level listed in enemy_weights_by_level replaces that level's
+whole mix, enemies left out weigh 0):
+
+    {
+      "player": {"speed": 150, "invulnerability": 1.5},
+      "enemies": {"SlimeFire": {"speed": 90, "chase_radius": 220}},
+      "walls_by_level": {"1": 7, "2": 9, "3": 12, "4": 15, "5": 18},
+      "enemy_count_by_level": {"1": 3, "2": 4, "3": 6, "4": 7, "5": 9},
+      "enemy_weights_by_level": {"2": {"SlimeNormal": 0.7, "SlimeFire": 0.3}}
+    }
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from .core import ENEMY_TYPES, Tuning
+
+ENEMY_NAMES = tuple(cls.__name__ for cls in ENEMY_TYPES)
+# tuning.json in the project folder (next to main.py)
+DEFAULT_TUNING_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tuning.json")
+
+
+def tuning_to_dict(tuning):
+    """Data-file form of a Tuning (used to write the default file)."""
+    return {
+        "player": {"speed": tuning.player_speed, "invulnerability": tuning.invulnerability},
+        "enemies": {
+            name: {"speed": speed, "chase_radius": radius}
+            for name, (speed, radius) in tuning.enemies.items()
+        },
+        "walls_by_level": {str(level): count for level, count in tuning.walls_by_level.items()},
+        "enemy_count_by_level": {str(level): count for level, count in tuning.enemy_count_by_level.items()},
+        "enemy_weights_by_level": {
+            str(level): {name: weight for name, weight in zip(ENEMY_NAMES, weights) if weight}
+            for level, weights in tuning.enemy_weights_by_level.items()
+        },
+    }
+
+
+def parse_tuning(data, base=None):
+    """Validate the data-file dict and return a Tuning.
+
+    Values missing from `data` are taken from `base` (default: the original
+    numbers). Raise ValueError listing every problem found.
+    """
+    base = base or Tuning()
+    problems = []
+
+    def number(value, where, low=0.0, high=None, integer=False):
+        kind = int if integer else (int, float)
+        if isinstance(value, bool) or not isinstance(value, kind):
+            problems.append(f"{where}: expected {'an integer' if integer else 'a number'}, got {value!r}")
+        elif value < low or (high is not None and value > high):
+            problems.append(f"{where}: {value} out of range {low}..{high if high is not None else ''}")
+        return value
+
+    def section(name):
+        value = data.get(name, {})
+        if not isinstance(value, dict):
+            problems.append(f"{name}: expected an object")
+            return {}
+        return value
+
+    def levels(name):
+        table = {}
+        for key, value in section(name).items():
+            try:
+                level = int(key)
+            except ValueError:
+                problems.append(f"{name}: level {key!r} is not a number")
+                continue
+            if level < 1:
+                problems.append(f"{name}: level {level} must be 1 or more")
+                continue
+            table[level] = value
+        return table
+
+    if not isinstance(data, dict):
+        raise ValueError("tuning file: expected a JSON object")
+    unknown = set(data) - {"player", "enemies", "walls_by_level", "enemy_count_by_level", "enemy_weights_by_level"}
+    if unknown:
+        problems.append(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    player = section("player")
+    player_speed = number(player.get("speed", base.player_speed), "player.speed", 1, 1000)
+    invulnerability = number(player.get("invulnerability", base.invulnerability), "player.invulnerability", 0, 10)
+
+    enemies = dict(base.enemies)
+    for name, values in section("enemies").items():
+        if name not in ENEMY_NAMES:
+            problems.append(f"enemies: unknown enemy {name!r} (known: {', '.join(ENEMY_NAMES)})")
+            continue
+        if not isinstance(values, dict):
+            problems.append(f"enemies.{name}: expected an object")
+            continue
+        speed, radius = enemies[name]
+        enemies[name] = (
+            number(values.get("speed", speed), f"enemies.{name}.speed", 0, 1000),
+            number(values.get("chase_radius", radius), f"enemies.{name}.chase_radius", 0, 2000),
+        )
+
+    walls_by_level = dict(base.walls_by_level)
+    for level, count in levels("walls_by_level").items():
+        walls_by_level[level] = number(count, f"walls_by_level.{level}", 0, 100, integer=True)
+    enemy_count_by_level = dict(base.enemy_count_by_level)
+    for level, count in levels("enemy_count_by_level").items():
+        enemy_count_by_level[level] = number(count, f"enemy_count_by_level.{level}", 0, 50, integer=True)
+
+    enemy_weights_by_level = dict(base.enemy_weights_by_level)
+    for level, weights in levels("enemy_weights_by_level").items():
+        where = f"enemy_weights_by_level.{level}"
+        if not isinstance(weights, dict):
+            problems.append(f"{where}: expected an object {{enemy name: weight}}")
+            continue
+        for name in weights:
+            if name not in ENEMY_NAMES:
+                problems.append(f"{where}: unknown enemy {name!r}")
+        row = tuple(number(weights.get(name, 0), f"{where}.{name}") for name in ENEMY_NAMES)
+        if not problems and sum(row) <= 0:
+            problems.append(f"{where}: weights must not all be 0")
+        enemy_weights_by_level[level] = row
+
+    if problems:
+        raise ValueError("\n".join(problems))
+    return Tuning(player_speed, invulnerability, enemies, walls_by_level, enemy_count_by_level,
+                  enemy_weights_by_level)
+
+
+def load_tuning(path):
+    """Read and validate a tuning file."""
+    with open(path, "rb") as f:
+        return parse_tuning(json.loads(f.read()))
+
+
+class TuningWatcher:
+    """Reload a tuning file when it changes.
+
+    - path: the JSON data file
+    - interval: seconds between two os.stat() calls
+    - clock: time source
+    """
+
+    def __init__(self, path, interval=0.5, clock=time.monotonic):
+        self.path = str(path)
+        self.interval = interval
+        self.clock = clock
+        self.error = None
+        self.reloads = 0
+        self._next_check = 0.0
+        self._stat = None
+        self._digest = None
+
+    def poll(self):
+        """Return a new Tuning if the file changed and is valid, else None."""
+        now = self.clock()
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.interval
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._stat:
+            return None
+        self._stat = signature
+
+        try:
+            with open(self.path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        digest = hashlib.sha1(content).digest()
+        if digest == self._digest:
+            return None
+        self._digest = digest
+        try:
+            tuning = parse_tuning(json.loads(content))
+        except ValueError as error:
+            # json.JSONDecodeError is a ValueError too
+            self.error = f"{self.path}: {error}"
+            return None
+        self.error = None
+        self.reloads += 1
+        return tuning
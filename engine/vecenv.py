@@ -0,0 +1,358 @@
+"""Batched environment: N independent dungeon runs stepped in lockstep.
+
+`VecDungeonEnv` keeps the state of every world in NumPy arrays (one row
+per world, one column per enemy slot) and applies the rules of
+`World.update()` to all of them at once: player input and movement, the
+four slime AIs, wall collisions, hits and invulnerability, key, door,
+next level and victory. Per step the work is a fixed number of array
+operations whatever the number of worlds, so thousands of worlds step in
+about the time one Python World takes for a few ticks.
+
+Levels still come from `World.generate_level()` (so level banks and
+authored levels work through `env.world`); only starting a level runs
+Python code per world. Random AI choices (wandering, patrols) use a NumPy
+generator, so runs follow the same rules as the game but not the same
+random sequence as a World with the same seed.
+
+NumPy is needed by this module only (pip install numpy); the game does
+not import it.
+
+    env = VecDungeonEnv(1024, seed=1)
+    obs = env.reset()
+    obs, reward, done, info = env.step(np.random.randint(0, len(ACTIONS), 1024))
+"""
+
+import numpy as np
+
+from .core import (
+    ENEMY_TYPES,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    HEIGHT,
+    HUD_HEIGHT,
+    LEVEL_COUNT,
+    TILE_SIZE,
+    WIDTH,
+    World,
+)
+
+# Action index -> (dx, dy), as the keyboard would set them
+ACTIONS = np.array([
+    (0, 0),
+    (-1, 0), (1, 0), (0, -1), (0, 1),
+    (-1, -1), (1, -1), (-1, 1), (1, 1),
+], dtype=np.float64)
+
+DEFAULT_REWARDS = {"key": 1.0, "level": 1.0, "hit": -1.0, "step": 0.0}
+
+PLAYER_HITBOX = 22
+ENEMY_HITBOX = 20
+KEY_PICKUP_SIZE = 24
+DOOR_SIZE = TILE_SIZE
+# Enemy type indices (ENEMY_TYPES order) and the timer attribute of each
+NORMAL, FIRE, BLOCK, SPIKE = range(4)
+TIMER_ATTRS = ("behavior_timer", "patrol_timer", None, "change_direction_timer")
+WANDER_DIRECTIONS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1), (0.7, 0.7), (-0.7, 0.7)])
+FIRE_STEPS = np.array([-1, 0, 1], dtype=np.float64)
+SPIKE_STEPS = np.array([-1, -0.7, 0, 0.7, 1])
+
+# Observation: these player/level fields, then ENEMY_FIELDS per enemy slot.
+# Positions are divided by the window size, health by the maximum health.
+PLAYER_FIELDS = ("x", "y", "health", "invulnerable", "key_collected", "key_x", "key_y",
+                 "door_x", "door_y", "level")
+ENEMY_FIELDS = ("active", "type", "x", "y")
+
+
+class VecDungeonEnv:
+    """Step `num_worlds` dungeon runs at once; finished runs restart by themselves.
+
+    - num_worlds: worlds stepped together
+    - seed: seeds the level generator and the AI random choices
+    - dt: seconds per step (the game runs at 1/60)
+    - max_steps: steps after which a run is cut (done, info["truncated"])
+    - rewards: overrides of DEFAULT_REWARDS (key, level, hit, step)
+    - max_enemies: enemy slots per world (default: the most enemies the
+      tuning puts in a level)
+
+    The balance numbers come from `env.world.tuning` when a level starts.
+    """
+
+    def __init__(self, num_worlds, seed=None, dt=1 / 60, max_steps=60 * 60 * 3, rewards=None, max_enemies=None):
+        self.num_worlds = num_worlds
+        self.dt = dt
+        self.max_steps = max_steps
+        self.rewards = dict(DEFAULT_REWARDS, **(rewards or {}))
+        self.world = World(seed=seed)
+        self.rng = np.random.default_rng(seed)
+        tuning = self.world.tuning
+        self.max_enemies = max_enemies or max(tuning.enemy_count_by_level.values())
+
+        n, e = num_worlds, self.max_enemies
+        self.rows = np.arange(n)[:, None]
+        self.walls = np.zeros((n, GRID_HEIGHT, GRID_WIDTH), dtype=bool)
+        # Player and level state, one entry per world
+        self.player_x = np.zeros(n)
+        self.player_y = np.zeros(n)
+        self.player_speed = np.zeros(n)
+        self.health = np.zeros(n, dtype=np.int64)
+        self.max_health = np.zeros(n, dtype=np.int64)
+        self.invulnerable_timer = np.zeros(n)
+        self.invulnerability = np.zeros(n)
+        self.key_x = np.zeros(n)
+        self.key_y = np.zeros(n)
+        self.door_x = np.zeros(n)
+        self.door_y = np.zeros(n)
+        self.key_collected = np.zeros(n, dtype=bool)
+        self.level = np.ones(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.episode_return = np.zeros(n)
+        # Enemies, one column per slot; `active` marks the slots in use
+        self.active = np.zeros((n, e), dtype=bool)
+        self.enemy_type = np.zeros((n, e), dtype=np.int64)
+        self.enemy_x = np.zeros((n, e))
+        self.enemy_y = np.zeros((n, e))
+        self.enemy_dx = np.zeros((n, e))
+        self.enemy_dy = np.zeros((n, e))
+        self.enemy_speed = np.zeros((n, e))
+        self.chase_radius = np.zeros((n, e))
+        self.timer = np.zeros((n, e))
+        self.patrol_x = np.zeros((n, e, 2))
+        self.patrol_y = np.zeros((n, e))
+        self.patrol_target = np.zeros((n, e), dtype=np.int64)
+
+    @property
+    def observation_size(self):
+        """Length of one world's observation vector."""
+        return len(PLAYER_FIELDS) + len(ENEMY_FIELDS) * self.max_enemies
+
+    def reset(self):
+        """Start a new run in every world; return the observations."""
+        for index in range(self.num_worlds):
+            self._start_run(index)
+        return self.observe()
+
+    def _start_run(self, index):
+        """New game in world `index`: level 1, full health."""
+        self.steps[index] = 0
+        self.episode_return[index] = 0.0
+        self.world.player = None
+        self._start_level(index, 1)
+        self.health[index] = self.max_health[index] = self.world.player.max_health
+
+    def _start_level(self, index, level):
+        """Generate `level` with the shared World and copy it into row `index`."""
+        world = self.world
+        world.current_level = level
+        world.generate_level(level)
+        world.events.clear()
+        if len(world.enemies) > self.max_enemies:
+            raise ValueError(f"level {level} has {len(world.enemies)} enemies, max_enemies is {self.max_enemies}")
+
+        walls = self.walls[index]
+        walls[:] = False
+        for wall in world.walls:
+            walls[int(wall.y) // TILE_SIZE, int(wall.x) // TILE_SIZE] = True
+        player = world.player
+        self.player_x[index], self.player_y[index] = player.x, player.y
+        self.player_speed[index] = player.speed
+        self.invulnerability[index] = player.invulnerability
+        self.invulnerable_timer[index] = 0.0
+        self.key_x[index], self.key_y[index] = world.key_position
+        self.door_x[index], self.door_y[index] = world.door_position
+        self.key_collected[index] = False
+        self.level[index] = level
+
+        self.active[index] = False
+        self.enemy_dx[index] = self.enemy_dy[index] = 0.0
+        for slot, enemy in enumerate(world.enemies):
+            enemy_type = ENEMY_TYPES.index(type(enemy))
+            self.active[index, slot] = True
+            self.enemy_type[index, slot] = enemy_type
+            self.enemy_x[index, slot], self.enemy_y[index, slot] = enemy.x, enemy.y
+            self.enemy_dx[index, slot], self.enemy_dy[index, slot] = enemy.dx, enemy.dy
+            self.enemy_speed[index, slot] = enemy.speed
+            self.chase_radius[index, slot] = enemy.chase_radius
+            timer = TIMER_ATTRS[enemy_type]
+            self.timer[index, slot] = getattr(enemy, timer) if timer else 0.0
+            if enemy_type == BLOCK:
+                self.patrol_x[index, slot] = [point[0] for point in enemy.patrol_points]
+                self.patrol_y[index, slot] = enemy.patrol_points[0][1]
+                self.patrol_target[index, slot] = enemy.current_target
+
+    def _blocked(self, x, y, size):
+        """True where a size x size hitbox centered at (x, y) overlaps a wall tile."""
+        rows = self.rows if x.ndim == 2 else self.rows[:, 0]
+        left = x - size // 2
+        top = y - size // 2
+        # A hitbox smaller than a tile touches at most 2 x 2 tiles
+        tx0 = np.clip(np.floor(left / TILE_SIZE).astype(np.intp), 0, GRID_WIDTH - 1)
+        tx1 = np.clip(np.ceil((left + size) / TILE_SIZE).astype(np.intp) - 1, 0, GRID_WIDTH - 1)
+        ty0 = np.clip(np.floor(top / TILE_SIZE).astype(np.intp), 0, GRID_HEIGHT - 1)
+        ty1 = np.clip(np.ceil((top + size) / TILE_SIZE).astype(np.intp) - 1, 0, GRID_HEIGHT - 1)
+        walls = self.walls
+        return walls[rows, ty0, tx0] | walls[rows, ty0, tx1] | walls[rows, ty1, tx0] | walls[rows, ty1, tx1]
+
+    def _move(self, x, y, dx, dy, speed, size):
+        """Character.move for arrays: return the new x, y, dx, dy."""
+        dt = self.dt
+        magnitude = np.hypot(dx, dy)
+        moving = magnitude > 0
+        scale = np.where(moving, magnitude, 1.0)
+        dx = dx / scale
+        dy = dy / scale
+        new_x = x + dx * speed * dt
+        new_y = y + dy * speed * dt
+        blocked = self._blocked(new_x, new_y, size)
+        margin = size // 2
+        new_x = np.clip(new_x, margin, WIDTH - margin)
+        new_y = np.clip(new_y, margin, HEIGHT - HUD_HEIGHT - margin)
+        return np.where(blocked, x, new_x), np.where(blocked, y, new_y), dx, dy
+
+    def _think(self):
+        """The think() of every slime type, applied to the whole enemy table."""
+        dt = self.dt
+        rng = self.rng
+        ex, ey = self.enemy_x, self.enemy_y
+        to_x = self.player_x[:, None] - ex
+        to_y = self.player_y[:, None] - ey
+        dist = np.hypot(to_x, to_y)
+        active = self.active
+        enemy_type = self.enemy_type
+        chase = active & (dist < self.chase_radius)
+        toward = chase & (dist > 0)
+        safe_dist = np.where(toward, dist, 1.0)
+        self.enemy_dx = np.where(toward, to_x / safe_dist, self.enemy_dx)
+        self.enemy_dy = np.where(toward, to_y / safe_dist, self.enemy_dy)
+        roam = active & ~chase
+        timer = self.timer
+
+        # SlimeNormal: timer always runs, new wander direction when it ends
+        normal = enemy_type == NORMAL
+        timer[normal] -= dt
+        pick = roam & normal & (timer <= 0)
+        count = np.count_nonzero(pick)
+        if count:
+            direction = WANDER_DIRECTIONS[rng.integers(0, len(WANDER_DIRECTIONS), count)]
+            self.enemy_dx[pick] = direction[:, 0]
+            self.enemy_dy[pick] = direction[:, 1]
+            timer[pick] = 1.0 + rng.random(count)
+
+        # SlimeFire: patrol timer only runs while not chasing
+        patrol = roam & (enemy_type == FIRE)
+        timer[patrol] -= dt
+        pick = patrol & (timer <= 0)
+        count = np.count_nonzero(pick)
+        if count:
+            self.enemy_dx[pick] = FIRE_STEPS[rng.integers(0, 3, count)]
+            self.enemy_dy[pick] = FIRE_STEPS[rng.integers(0, 3, count)]
+            timer[pick] = 2.0
+
+        # SlimeSpike: timer always runs, erratic direction when it ends
+        spike = enemy_type == SPIKE
+        timer[spike] -= dt
+        pick = roam & spike & (timer <= 0)
+        count = np.count_nonzero(pick)
+        if count:
+            self.enemy_dx[pick] = SPIKE_STEPS[rng.integers(0, len(SPIKE_STEPS), count)]
+            self.enemy_dy[pick] = SPIKE_STEPS[rng.integers(0, len(SPIKE_STEPS), count)]
+            timer[pick] = 0.5 + rng.random(count)
+
+        # SlimeBlock: walk between two patrol points. As in the game, the
+        # direction to a just-switched point is divided by the distance to
+        # the previous one.
+        block = roam & (enemy_type == BLOCK)
+        if block.any():
+            target_x = np.take_along_axis(self.patrol_x, self.patrol_target[..., None], 2)[..., 0]
+            dist_target = np.hypot(target_x - ex, self.patrol_y - ey)
+            reached = block & (dist_target < 10)
+            self.patrol_target = np.where(reached, 1 - self.patrol_target, self.patrol_target)
+            target_x = np.take_along_axis(self.patrol_x, self.patrol_target[..., None], 2)[..., 0]
+            walk = block & (dist_target > 0)
+            safe_dist = np.where(walk, dist_target, 1.0)
+            self.enemy_dx = np.where(walk, (target_x - ex) / safe_dist, self.enemy_dx)
+            self.enemy_dy = np.where(walk, (self.patrol_y - ey) / safe_dist, self.enemy_dy)
+
+    def step(self, actions):
+        """Advance every world by one tick.
+
+        - actions: integer array (num_worlds,) of indices into ACTIONS
+
+        Return (observations, rewards, dones, info). Worlds that finished
+        (game over, victory or max_steps) are already restarted: their
+        observation is the first of the new run, and info holds, for
+        every world, "terminal_observation", "level" (reached), "victory"
+        and "truncated", meaningful where done is True.
+        """
+        dt = self.dt
+        rewards = self.rewards
+        reward = np.full(self.num_worlds, rewards["step"])
+        self.steps += 1
+
+        # Player: invulnerability timer, input, movement
+        self.invulnerable_timer = np.where(self.invulnerable_timer > 0, self.invulnerable_timer - dt,
+                                           self.invulnerable_timer)
+        direction = ACTIONS[np.asarray(actions)]
+        self.player_x, self.player_y, _, _ = self._move(
+            self.player_x, self.player_y, direction[:, 0], direction[:, 1], self.player_speed, PLAYER_HITBOX)
+
+        # Enemies: AI, movement, contact with the player
+        self._think()
+        self.enemy_x, self.enemy_y, self.enemy_dx, self.enemy_dy = self._move(
+            self.enemy_x, self.enemy_y, self.enemy_dx, self.enemy_dy, self.enemy_speed, ENEMY_HITBOX)
+        px, py = self.player_x[:, None], self.player_y[:, None]
+        reach = (PLAYER_HITBOX + ENEMY_HITBOX) / 2
+        touching = self.active & (np.abs(self.enemy_x - px) < reach) & (np.abs(self.enemy_y - py) < reach)
+        hit = touching.any(axis=1) & (self.invulnerable_timer <= 0)
+        self.health -= hit
+        self.invulnerable_timer = np.where(hit, self.invulnerability, self.invulnerable_timer)
+        reward += hit * rewards["hit"]
+        dead = self.health <= 0
+
+        # Key, then door (the same tick, as in the game)
+        alive = ~dead
+        reach = (PLAYER_HITBOX + KEY_PICKUP_SIZE) / 2
+        picked = alive & ~self.key_collected & (np.abs(self.key_x - self.player_x) < reach) & (
+            np.abs(self.key_y - self.player_y) < reach)
+        self.key_collected |= picked
+        reward += picked * rewards["key"]
+        reach = (PLAYER_HITBOX + DOOR_SIZE) / 2
+        exited = alive & self.key_collected & (np.abs(self.door_x - self.player_x) < reach) & (
+            np.abs(self.door_y - self.player_y) < reach)
+        reward += exited * rewards["level"]
+        won = exited & (self.level >= LEVEL_COUNT)
+        for index in np.flatnonzero(exited & ~won):
+            self._start_level(index, self.level[index] + 1)
+
+        truncated = ~dead & ~won & (self.steps >= self.max_steps)
+        done = dead | won | truncated
+        self.episode_return += reward
+        info = {
+            "terminal_observation": self.observe(),
+            "level": self.level.copy(),
+            "victory": won,
+            "truncated": truncated,
+            "episode_return": self.episode_return.copy(),
+        }
+        for index in np.flatnonzero(done):
+            self._start_run(index)
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        """Observation array (num_worlds, observation_size), float32."""
+        obs = np.empty((self.num_worlds, self.observation_size), dtype=np.float32)
+        obs[:, 0] = self.player_x / WIDTH
+        obs[:, 1] = self.player_y / HEIGHT
+        obs[:, 2] = self.health / self.max_health
+        obs[:, 3] = self.invulnerable_timer > 0
+        obs[:, 4] = self.key_collected
+        obs[:, 5] = self.key_x / WIDTH
+        obs[:, 6] = self.key_y / HEIGHT
+        obs[:, 7] = self.door_x / WIDTH
+        obs[:, 8] = self.door_y / HEIGHT
+        obs[:, 9] = self.level / LEVEL_COUNT
+        enemies = obs[:, len(PLAYER_FIELDS):].reshape(self.num_worlds, self.max_enemies, len(ENEMY_FIELDS))
+        enemies[..., 0] = self.active
+        enemies[..., 1] = self.enemy_type / (len(ENEMY_TYPES) - 1)
+        enemies[..., 2] = np.where(self.active, self.enemy_x / WIDTH, 0)
+        enemies[..., 3] = np.where(self.active, self.enemy_y / HEIGHT, 0)
+        return obs
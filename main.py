@@ -10,9 +10,11 @@ Main features:
 - 5 levels with increasing difficulty
 - Main menu, pause, game over, victory screens
 
-Allowed dependencies:
-- PgZero (framework), math.hypot, random (choice, random, randint)
-- Exception: Rect imported from pygame for collisions
+Dependencies:
+- PgZero (framework) for the game loop, Actors, images and sounds
+- pygame, which PgZero runs on: Rect, the mixer, the display updates of
+  dirty-rect mode and the scaled canvas (with pgzero.screen and pgzero.loaders)
+- engine/: the game rules and the front-end independent helpers
 
 How to run:
   python -m pgzero main.py
@@ -25,380 +27,175 @@ Controls:
 - End screens: SPACE to return to the menu
 """
 
+import atexit
+import os
+import time
+from math import ceil, floor
+
 import pgzrun
-from math import hypot
-from random import choice, random, randint
-from pygame import Rect
-## Note: only using allowed libraries (PgZero, math, random). No direct pygame usage except Rect.
-
-# Window and tile constants
-# The world is a grid of TILE_SIZE cells drawn inside the window.
-WIDTH = 800
-HEIGHT = 600
-TILE_SIZE = 40
-GRID_WIDTH = 20
-GRID_HEIGHT = 14
-HUD_HEIGHT = 40
+import pygame
+from pgzero import loaders
+from pgzero.screen import Screen, SurfacePainter
+from pygame import Rect, mixer
+from engine.core import (
+    WIDTH,
+    HEIGHT,
+    HUD_HEIGHT,
+    STATE_MENU,
+    STATE_PLAYING,
+    STATE_GAME_OVER,
+    STATE_VICTORY,
+    STATE_PAUSED,
+    InputState,
+    World,
+)
+from engine.audio import NullBackend, SoundBackend, VoiceManager
+from engine.governor import QualityGovernor
+from engine.inputbuffer import InputBuffer, LatencyHistogram
+from engine.levelbank import LevelBank
+from engine.tilemap import load_map
+from engine.memtrack import MemoryTracker
+from engine.profiling import ProfileCapture
+from engine.recording import PositionRecorder
+from engine.render import DirtyRectTracker, bounds_of
+from engine.spectator import SpectatorServer
+from engine.telemetry import Telemetry
+from engine.tuning import DEFAULT_TUNING_FILE, TuningWatcher
+## Note: pygame is used directly only where PgZero has no equivalent (see Dependencies above).
+## The game rules live in engine/core.py (pure Python); this file is the PgZero front-end.
+
 # Standard size for HUD icons (hearts, key)
 HUD_ICON_PX = 32
 
-# Game states
-STATE_MENU = "menu"
-STATE_PLAYING = "playing"
-STATE_GAME_OVER = "game_over"
-STATE_VICTORY = "victory"
-STATE_PAUSED = "paused"
+# Sound effect played for each world event (see World docstring)
+EVENT_SOUNDS = {
+    "game_started": "start",
+    "hit": "hit",
+    "key_collected": "pickup",
+    "next_level": "nextlevel",
+    "game_over": "gameover",
+    "victory": "victory",
+}
 
 # Global game variables
-# These globals keep the current game state and world entities.
-game_state = STATE_MENU
-current_level = 1
-player = None
-enemies = []
-walls = []
-floor_tiles = []
-key_collected = False
-door_position = None
-key_position = None
+# The world keeps the game state and entities; the front-end only keeps
+# sprites, audio options and menu buttons.
+world = World()
 key_actor = None
 door_actor = None
 music_enabled = True
 sound_enabled = True
 menu_buttons = []
 pause_buttons = []
-level_time_accum = 0.0
-level_times = []
-
-
-class Animation:
-    """Frame-based animation helper for sprites.
-
-    - frames: list of image names (strings) loadable by PgZero
-    - fps: frames per second (animation speed)
-    """
-    
-    def __init__(self, frames, fps=8):
-        self.frames = frames
-        self.fps = fps
-        self.current_frame = 0
-        self.time_accumulated = 0.0
-    
-    def update(self, dt):
-        """Advance the animation based on elapsed time (dt in seconds)."""
-        self.time_accumulated += dt
-        frame_duration = 1.0 / self.fps
-        
-        while self.time_accumulated >= frame_duration:
-            self.time_accumulated -= frame_duration
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-    
-    def get_current_frame(self):
-        """Return the name of the current frame image."""
-        return self.frames[self.current_frame]
-    
-    def reset(self):
-        """Reset to the first frame and clear accumulated time."""
-        self.current_frame = 0
-        self.time_accumulated = 0.0
-
-
-class Character:
-    """Base class for entities with movement, collisions and animations.
-
-    Responsibilities:
-    - manage position, direction and speed
-    - axis-aligned collision with walls using Rect (AABB)
-    - pick and update the current animation (idle/move)
-    """
-
-    def __init__(self, x, y, speed, hitbox_size=20):
-        """Initialize the character.
-
-        Parameters:
-        - x, y: initial pixel coordinates (center)
-        - speed: pixels per second
-        - hitbox_size: side of the square hitbox (px)
-        """
-        self.x = x
-        self.y = y
-        self.speed = speed
-        self.dx = 0
-        self.dy = 0
-        self.state = "idle"
-        self.animations = {}
-        self.actor = None
-        # Smaller and centered hitbox
-        half_size = hitbox_size // 2
-        self.hitbox = Rect(x - half_size, y - half_size, hitbox_size, hitbox_size)
-    
-    def setup_animations(self, idle_frames, move_frames):
-        """Register 'idle' and 'move' animations and create the Actor."""
-        self.animations["idle"] = Animation(idle_frames, fps=6)
-        self.animations["move"] = Animation(move_frames, fps=8)
-
-        # Create actor with first frame and apply scale
-        if idle_frames:
-            self.actor = Actor(idle_frames[0], (self.x, self.y))
-    
-    def move(self, dt):
-        """Update position using normalized input and handle wall collisions."""
-        if abs(self.dx) > 0.01 or abs(self.dy) > 0.01:
-            self.state = "move"
-        else:
-            self.state = "idle"
-
-        # Normalize diagonal movement so diagonals are not faster
-        mag = hypot(self.dx, self.dy)
-        if mag > 0:
-            self.dx /= mag
-            self.dy /= mag
-
-        # Calculate new position
-        new_x = self.x + self.dx * self.speed * dt
-        new_y = self.y + self.dy * self.speed * dt
-
-        # Check collision with walls: create hitbox at new position
-        half_size = self.hitbox.width // 2
-        new_hitbox = Rect(new_x - half_size, new_y - half_size, self.hitbox.width, self.hitbox.height)
-        collision = False
-
-        for wall in walls:
-            if new_hitbox.colliderect(wall):
-                collision = True
-                break
-
-        # Update position if no collision
-        if not collision:
-            # Keep within screen bounds
-            margin = self.hitbox.width // 2
-            self.x = max(margin, min(WIDTH - margin, new_x))
-            self.y = max(margin, min(HEIGHT - HUD_HEIGHT - margin, new_y))
-            self.hitbox.center = (self.x, self.y)
-
-            if self.actor:
-                self.actor.pos = (self.x, self.y)
-    
-    def update_animation(self, dt):
-        """Advance the current state's animation and update the Actor image."""
-        if self.state in self.animations:
-            anim = self.animations[self.state]
-            anim.update(dt)
-            if self.actor:
-                self.actor.image = anim.get_current_frame()
-                # Simply update the current frame image
-    
-    def draw(self):
-        """Draw the sprite on screen (if the Actor is present)."""
-        if self.actor:
-            self.actor.draw()
-
-
-class Player(Character):
-    """Player entity: handles input, health and invulnerability."""
-
-    def __init__(self, x, y):
-        """Create the player with default animations and hitbox."""
-        # Player sprite pre-scaled to 32x32, hitbox 22 px
-        super().__init__(x, y, speed=150, hitbox_size=22)
-        self.health = 3
-        self.max_health = 3
-        self.invulnerable_timer = 0
-
-        # Setup player animations with new character_beige sprites
-        self.setup_animations(
-            idle_frames=["characters/character_beige_idle", "characters/character_beige_idle"],
-            move_frames=["characters/character_beige_walk_a", "characters/character_beige_walk_b"]
-        )
-    
-    def handle_input(self):
-        """Read keyboard (WASD/Arrows) and set movement direction."""
-        self.dx = 0
-        self.dy = 0
-        
-        if keyboard.left or keyboard.a:
-            self.dx = -1
-        if keyboard.right or keyboard.d:
-            self.dx = 1
-        if keyboard.up or keyboard.w:
-            self.dy = -1
-        if keyboard.down or keyboard.s:
-            self.dy = 1
-    
-    def take_damage(self, amount=1):
-        """Apply damage when not invulnerable; play SFX and trigger game over if needed."""
-        if self.invulnerable_timer <= 0:
-            self.health -= amount
-            self.invulnerable_timer = 1.5  # 1.5 seconds of invulnerability
-            
-            if sound_enabled:
-                sounds.hit.play()
-            
-            if self.health <= 0:
-                game_over()
-    
-    def update(self, dt):
-        """Update invulnerability timer, movement and animation."""
-        # Update invulnerability timer
-        if self.invulnerable_timer > 0:
-            self.invulnerable_timer -= dt
-        
-        self.handle_input()
-        self.move(dt)
-        self.update_animation(dt)
-
-
-class Enemy(Character):
-    """Base enemy class: each subclass implements `think` (AI)."""
-
-    def __init__(self, x, y, speed):
-        """Initialize a generic enemy with speed and hitbox."""
-        # Enemy sprite pre-scaled to 32x32, hitbox 20 px
-        super().__init__(x, y, speed, hitbox_size=20)
-        self.behavior_timer = 0
-    
-    def think(self, player_pos, dt):
-        """Decide enemy dx/dy based on player position (override)."""
-        pass
-    
-    def update(self, dt, player_pos):
-        """Update AI, movement and animation."""
-        self.think(player_pos, dt)
-        self.move(dt)
-        self.update_animation(dt)
-
-
-class SlimeNormal(Enemy):
-    """Green slime: wanders randomly, chases when close."""
-
-    def __init__(self, x, y):
-        super().__init__(x, y, speed=50)
-        self.setup_animations(
-            idle_frames=["enemies/slime_normal_rest", "enemies/slime_normal_rest"],
-            move_frames=["enemies/slime_normal_walk_a", "enemies/slime_normal_walk_b"]
-        )
-        self.wander_direction()
-
-    def wander_direction(self):
-        """Pick a random direction to wander for a while."""
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1), (0.7, 0.7), (-0.7, 0.7)]
-        direction = choice(directions)
-        self.dx = direction[0]
-        self.dy = direction[1]
-        self.behavior_timer = 1.0 + random()
-
-    def think(self, player_pos, dt):
-        """Chase within 120 px, otherwise keep wandering."""
-        self.behavior_timer -= dt
-
-        # Calculate distance to player
-        dist = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
-
-        if dist < 120:  # Chase radius
-            # Chase player
-            if dist > 0:
-                self.dx = (player_pos[0] - self.x) / dist
-                self.dy = (player_pos[1] - self.y) / dist
-        elif self.behavior_timer <= 0:
-            # Wander randomly
-            self.wander_direction()
-
-
-class SlimeFire(Enemy):
-    """Fire slime: faster; actively hunts the player."""
-
-    def __init__(self, x, y):
-        super().__init__(x, y, speed=80)
-        self.setup_animations(
-            idle_frames=["enemies/slime_fire_rest", "enemies/slime_fire_rest"],
-            move_frames=["enemies/slime_fire_walk_a", "enemies/slime_fire_walk_b"]
-        )
-        self.patrol_timer = 0
-
-    def think(self, player_pos, dt):
-        """Chase within 200 px, otherwise patrol with short intervals."""
-        dist = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
-
-        if dist < 200:  # Detection radius
-            # Direct pursuit
-            if dist > 0:
-                self.dx = (player_pos[0] - self.x) / dist
-                self.dy = (player_pos[1] - self.y) / dist
-        else:
-            # Patrol behavior
-            self.patrol_timer -= dt
-            if self.patrol_timer <= 0:
-                self.dx = choice([-1, 0, 1])
-                self.dy = choice([-1, 0, 1])
-                self.patrol_timer = 2.0
-
-
-class SlimeBlock(Enemy):
-    """Block slime: patrols between two points; attacks when nearby."""
-
-    def __init__(self, x, y):
-        super().__init__(x, y, speed=60)
-        self.setup_animations(
-            idle_frames=["enemies/slime_block_rest", "enemies/slime_block_rest"],
-            move_frames=["enemies/slime_block_walk_a", "enemies/slime_block_walk_b"]
-        )
-        self.patrol_points = [(x - 80, y), (x + 80, y)]
-        self.current_target = 0
-
-    def think(self, player_pos, dt):
-        """Chase if close to the player; otherwise follow patrol points."""
-        dist_to_player = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
-
-        if dist_to_player < 100:  # Attack radius
-            # Chase player
-            if dist_to_player > 0:
-                self.dx = (player_pos[0] - self.x) / dist_to_player
-                self.dy = (player_pos[1] - self.y) / dist_to_player
-        else:
-            # Patrol between points
-            target = self.patrol_points[self.current_target]
-            dist_to_target = hypot(target[0] - self.x, target[1] - self.y)
-
-            if dist_to_target < 10:  # Reached patrol point
-                self.current_target = (self.current_target + 1) % len(self.patrol_points)
-                target = self.patrol_points[self.current_target]
-
-            # Move towards patrol point
-            if dist_to_target > 0:
-                self.dx = (target[0] - self.x) / dist_to_target
-                self.dy = (target[1] - self.y) / dist_to_target
-
 
-class SlimeSpike(Enemy):
-    """Spike slime: alternates aggressive chase and erratic movement."""
-
-    def __init__(self, x, y):
-        super().__init__(x, y, speed=70)
-        self.setup_animations(
-            idle_frames=["enemies/slime_spike_rest", "enemies/slime_spike_rest"],
-            move_frames=["enemies/slime_spike_walk_a", "enemies/slime_spike_walk_b"]
-        )
-        self.change_direction_timer = 0
-        self.is_aggressive = False
-
-    def think(self, player_pos, dt):
-        """Aggressive if the player is within 150 px; otherwise moves unpredictably."""
-        self.change_direction_timer -= dt
-        dist = hypot(player_pos[0] - self.x, player_pos[1] - self.y)
-
-        if dist < 150:  # Detection radius
-            # Aggressive mode: chase player directly
-            self.is_aggressive = True
-            if dist > 0:
-                self.dx = (player_pos[0] - self.x) / dist
-                self.dy = (player_pos[1] - self.y) / dist
-        else:
-            # Erratic movement mode
-            if self.change_direction_timer <= 0:
-                # Change direction randomly every 0.5-1.5 seconds
-                self.dx = choice([-1, -0.7, 0, 0.7, 1])
-                self.dy = choice([-1, -0.7, 0, 0.7, 1])
-                self.change_direction_timer = 0.5 + random()
-                self.is_aggressive = False
+# Sound effects go through a voice manager: at most MAX_SFX_VOICES at once,
+# with per-effect priority and cooldown (see engine/audio.py). Without an
+# audio device the null backend keeps the same bookkeeping silently.
+MAX_SFX_VOICES = 4
+audio = VoiceManager(SoundBackend(sounds) if mixer.get_init() else NullBackend(), max_voices=MAX_SFX_VOICES)
+
+# Optional dirty-rect mode for gameplay frames: only the regions under the
+# sprites (and the HUD when it changes) are repainted and sent to the
+# display; any state or level change falls back to a full redraw.
+DIRTY_RECT_RENDERING = False
+dirty_tracker = DirtyRectTracker(WIDTH, HEIGHT)
+# Regions to present for the frame just drawn (None: the whole display)
+display_rects = None
+background_surface = None
+last_drawn_state = None
+last_hud_signature = None
+
+# Adaptive quality: when frames get slow, step down through quality tiers
+# (frozen idle animations, slower AI, cached HUD) instead of dropping below
+# 30 fps. F3 toggles an overlay with frame time and current tier.
+ADAPTIVE_QUALITY = True
+governor = QualityGovernor() if ADAPTIVE_QUALITY else None
+show_perf_overlay = False
+hud_cache = None
+hud_cache_signature = None
+
+# Live spectators: set a port (e.g. 8765) to stream the run on localhost,
+# then watch it with `python -m pgzero viewer.py`.
+SPECTATOR_PORT = None
+spectator = None
+
+# Run telemetry: set a folder (e.g. "telemetry") to record one session
+# file per launch; summarize them with `python -m tools.telemetry_summary`.
+TELEMETRY_DIR = None
+telemetry = None
+
+# Position recordings: set a folder (e.g. "recordings") to save player and
+# enemy positions every tick; turn them into heatmaps with
+# `python -m tools.heatmap recordings/ telemetry/`.
+RECORDING_DIR = None
+recorder = None
+
+# Memory tracking: when True, tracemalloc runs for the whole session and a
+# report (live objects, traced memory, top allocation sites) is printed at
+# every level transition. Headless check: `python -m tools.leak_check`.
+MEMORY_TRACKING = False
+memory_tracker = None
+
+# Balance numbers (speeds, chase radii, walls and enemies per level, enemy
+# mix, invulnerability) live in tuning.json: edit and save it while the
+# game runs and the change applies on the next tick. Set to None to keep
+# the built-in numbers.
+TUNING_FILE = DEFAULT_TUNING_FILE
+tuning_watcher = None
+
+# Profiling: F9 profiles update() and draw() for PROFILE_FRAMES frames and
+# writes a .pstats, a .collapsed (flamegraph) and a .json (context) file to PROFILE_DIR.
+PROFILE_FRAMES = 300
+PROFILE_DIR = "profiles"
+profile_capture = ProfileCapture(PROFILE_DIR, PROFILE_FRAMES)
+
+# Pre-baked levels: set the path of a bank written by
+# `python -m tools.bake_levels levels.bin` to load levels from it
+# (memory-mapped) instead of generating them.
+LEVEL_BANK = None
+
+# Input: key events are queued with timestamps (InputBuffer), so a tap
+# shorter than a frame still moves the player for one tick. The latency from
+# handling a key-down to the flip of the first frame showing it is measured,
+# and the frame pacing wait (flip to next update) separately; the F3 overlay
+# shows input p50/p95 and the pacing p50 and, with INPUT_LATENCY_REPORT, a
+# histogram is printed at the end of every run.
+INPUT_LATENCY_REPORT = False
+input_buffer = InputBuffer()
+input_latency = LatencyHistogram()
+DIRECTION_KEYS = {
+    keys.LEFT: "left", keys.A: "left",
+    keys.RIGHT: "right", keys.D: "right",
+    keys.UP: "up", keys.W: "up",
+    keys.DOWN: "down", keys.S: "down",
+}
+
+# Hand-authored levels: {level number: map file in levels/, or a list of
+# files to pick one from}, e.g. {1: "tutorial.map", 3: ["arena.map"]}.
+# Levels not listed are generated (or taken from LEVEL_BANK) as usual.
+AUTHORED_LEVELS = {}
+
+# Render scale: the world, HUD and menus are drawn into an offscreen canvas
+# of RENDER_SCALE x 800x600 pixels, scaled once per frame to a window of
+# WINDOW_SIZE. RENDER_SCALE = 0.5 draws a quarter of the pixels on slow
+# machines; WINDOW_SIZE = (1600, 1200) presents at twice the size with the
+# same drawing work. INTEGER_SCALING only scales by whole factors (sharp
+# pixels, black borders around the picture if the window is larger).
+RENDER_SCALE = 1.0
+WINDOW_SIZE = (WIDTH, HEIGHT)
+INTEGER_SCALING = False
+render_target = None
+
+# Idle screens: menu, pause, game over and victory only change on hover,
+# clicks and keys. With REDRAW_ON_CHANGE they are redrawn only when what
+# they show changes (the game frame behind the pause panel is drawn once
+# and cached) and, while nothing changes, update() sleeps until the next
+# input event or for at most IDLE_WAIT seconds instead of running at 60 fps.
+REDRAW_ON_CHANGE = True
+IDLE_WAIT = 0.25
+idle_drawn_signature = None
+idle_waited = False
+paused_frame = None
 
 
 class MenuButton:
@@ -433,160 +230,219 @@ class MenuButton:
         )
 
 
-def generate_level(level_num):
-    """Generate a dungeon level and place entities.
+class ScaledScreen(Screen):
+    """PgZero screen that draws into an offscreen canvas and presents it scaled.
 
-    Steps:
-    1) Create border walls + some random internal walls
-    2) Compute the list of free floor tiles
-    3) Place player, key, door and enemies on free tiles only
-
-    level_num: int (1..5) used to tune difficulty
+    The drawing code keeps using 800x600 coordinates: positions, rects and
+    font sizes are multiplied by `scale` on the way in and images are scaled
+    once, then cached. Surfaces passed to blit() are drawn as they are.
+    present() scales the canvas to the window (opened at `window_size`).
     """
-    global walls, floor_tiles, enemies, key_position, door_position, player, key_actor, door_actor
-    
-    walls.clear()
-    floor_tiles.clear()
-    enemies.clear()
-    
-    # 1) Create border walls (a rectangle around the play area)
-    for x in range(GRID_WIDTH):
-        walls.append(Rect(x * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE))
-        walls.append(Rect(x * TILE_SIZE, (GRID_HEIGHT - 1) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-    
-    for y in range(1, GRID_HEIGHT - 1):
-        walls.append(Rect(0, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-        walls.append(Rect((GRID_WIDTH - 1) * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-    
-    # Difficulty tuning per level (kid-friendly, explicit numbers)
-    walls_by_level = {1: 7, 2: 9, 3: 12, 4: 15, 5: 18}
-    enemy_count_by_level = {1: 3, 2: 4, 3: 6, 4: 7, 5: 9}
-
-    internal_walls = walls_by_level.get(level_num, 18)
-    enemy_count = enemy_count_by_level.get(level_num, 9)
-
-    # Add some random internal walls
-    for _ in range(internal_walls):
-        x = randint(2, GRID_WIDTH - 3)
-        y = randint(2, GRID_HEIGHT - 3)
-        walls.append(Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
-    
-    # 2) Create floor tiles (all non-wall cells in the grid)
-    for x in range(GRID_WIDTH):
-        for y in range(GRID_HEIGHT):
-            tile_rect = Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            is_wall = any(wall.colliderect(tile_rect) for wall in walls)
-            if not is_wall:
-                floor_tiles.append((x * TILE_SIZE, y * TILE_SIZE))
-    
-    # Helper: choose always-free tiles and use their centers for spawns
-    free_tiles = set(floor_tiles)
-    TILE_HALF = TILE_SIZE // 2
-
-    def tile_center(tile_pos):
-        tx, ty = tile_pos
-        return (tx + TILE_HALF, ty + TILE_HALF)
-
-    def distance(a, b):
-        return hypot(a[0] - b[0], a[1] - b[1])
-
-    def take_free_tile(min_dist_px=0, from_pos=None):
-        # Try to pick a tile far enough from from_pos (if provided)
-        if not free_tiles:
-            # Safety: if nothing free (shouldn't happen), fall back to center
-            return (WIDTH // 2, (HEIGHT - HUD_HEIGHT) // 2)
-        candidates = list(free_tiles)
-        # Shuffle-by-choice: sample up to len(candidates) tries
-        for _ in range(len(candidates)):
-            t = choice(candidates)
-            c = tile_center(t)
-            if from_pos is None or distance(c, from_pos) >= min_dist_px:
-                free_tiles.discard(t)
-                return c
-        # If no candidate met the distance, just take any
-        t = candidates[0]
-        free_tiles.discard(t)
-        return tile_center(t)
-
-    # 3) Place player on a guaranteed free tile (no health reset here)
-    player_pos = take_free_tile()
-    if player is None:
-        player = Player(player_pos[0], player_pos[1])
-    else:
-        player.x, player.y = player_pos
-        player.dx, player.dy = 0, 0
-        player.state = "idle"
-        player.invulnerable_timer = 0
-        player.hitbox.center = (player.x, player.y)
-        if player.actor:
-            player.actor.pos = (player.x, player.y)
-    
-    # Place key far from player (at least 6 tiles away)
-    key_position = take_free_tile(min_dist_px=6 * TILE_SIZE, from_pos=(player.x, player.y))
-    # Create key actor (pre-scaled to 32x32)
-    key_actor = Actor("key_yellow", key_position)
-
-    # Keep door position stable-ish: pick a free tile near the right side
-    # Try to pick a tile roughly to the right-center area
-    preferred = sorted(list(free_tiles), key=lambda t: (-t[0], abs((t[1]+TILE_HALF) - HEIGHT//2)))
-    door_tile = preferred[0] if preferred else None
-    if door_tile:
-        free_tiles.discard(door_tile)
-        door_position = tile_center(door_tile)
-    else:
-        door_position = (WIDTH - 100, HEIGHT // 2)
-    # Create door actor (already 40x40 = 1 tile)
-    door_actor = Actor("door_closed", door_position)
-    
-    # Spawn enemies based on level on guaranteed free tiles
-    for i in range(enemy_count):
-        ex, ey = take_free_tile(min_dist_px=2 * TILE_SIZE, from_pos=(player.x, player.y))
-        enemy_type = choose_enemy_type(level_num)
-        if enemy_type == 0:
-            enemies.append(SlimeNormal(ex, ey))
-        elif enemy_type == 1:
-            enemies.append(SlimeFire(ex, ey))
-        elif enemy_type == 2:
-            enemies.append(SlimeBlock(ex, ey))
+
+    def __init__(self, scale, window_size, integer_scaling=False):
+        self.scale = scale
+        self.window_size = tuple(window_size)
+        self.integer_scaling = integer_scaling
+        self.canvas = pygame.Surface((round(WIDTH * scale), round(HEIGHT * scale))).convert()
+        self.width, self.height = WIDTH, HEIGHT
+        self.window = None
+        self.dest = None
+        self.images = {}
+
+    @property
+    def surface(self):
+        """The canvas: everything is drawn here."""
+        return self.canvas
+
+    @surface.setter
+    def surface(self, display):
+        # PgZero assigns the display surface here when it opens its window
+        self.window = display
+        self.dest = None
+
+    @property
+    def draw(self):
+        return ScaledPainter(self)
+
+    def point(self, pos):
+        """Canvas pixel of an 800x600 position."""
+        return (round(pos[0] * self.scale), round(pos[1] * self.scale))
+
+    def rect(self, rect):
+        """Canvas rect covering an 800x600 rect (rounded outwards)."""
+        rect = Rect(rect)
+        left, top = int(rect.left * self.scale), int(rect.top * self.scale)
+        right, bottom = -int(-rect.right * self.scale), -int(-rect.bottom * self.scale)
+        return Rect(left, top, right - left, bottom - top)
+
+    def blit_bounds(self, name, pos):
+        """800x600 rect covering every canvas pixel that blit(name, pos) draws.
+
+        Images are placed with point() and scaled with round(), so their canvas
+        pixels do not follow the rounding of rect(): derive the bounds from the
+        canvas pixels, rounded outwards (floor the origin, ceil the far edge).
+        """
+        x, y = self.point(pos)
+        width, height = self.image(name).get_size()
+        left, top = floor(x / self.scale), floor(y / self.scale)
+        right, bottom = ceil((x + width) / self.scale), ceil((y + height) / self.scale)
+        return Rect(left, top, right - left, bottom - top)
+
+    def image(self, name):
+        """Image `name` scaled to the canvas (loaded and scaled once)."""
+        image = self.images.get(name)
+        if image is None:
+            image = loaders.images.load(name)
+            if self.scale != 1:
+                width, height = image.get_size()
+                size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+                image = pygame.transform.smoothscale(image, size)
+            self.images[name] = image
+        return image
+
+    def blit(self, image, pos):
+        """Draw an image (by name, scaled) or a canvas-sized surface at an 800x600 position."""
+        if isinstance(image, str):
+            image = self.image(image)
+        if isinstance(pos, Rect):
+            pos = pos.topleft
+        self.canvas.blit(image, self.point(pos))
+
+    def to_view(self, pos):
+        """800x600 position of a window position (e.g. the mouse)."""
+        if self.dest is None:
+            return pos
+        return ((pos[0] - self.dest.x) * WIDTH / self.dest.width,
+                (pos[1] - self.dest.y) * HEIGHT / self.dest.height)
+
+    def present(self):
+        """Scale the canvas into the window; call once per frame after drawing."""
+        if self.window is None:
+            return
+        if self.dest is None:
+            if self.window.get_size() != self.window_size:
+                self.window = pygame.display.set_mode(self.window_size)
+            window_w, window_h = self.window_size
+            canvas_w, canvas_h = self.canvas.get_size()
+            factor = min(window_w / canvas_w, window_h / canvas_h)
+            if self.integer_scaling and factor >= 1:
+                factor = int(factor)
+            size = (round(canvas_w * factor), round(canvas_h * factor))
+            self.dest = Rect((0, 0), size)
+            self.dest.center = (window_w // 2, window_h // 2)
+            self.window.fill((0, 0, 0))
+        target = self.window.subsurface(self.dest)
+        if self.dest.size == self.canvas.get_size():
+            target.blit(self.canvas, (0, 0))
         else:
-            enemies.append(SlimeSpike(ex, ey))
+            # Nearest-neighbour: smoothscale of a whole frame costs more
+            # than the drawing it saves
+            pygame.transform.scale(self.canvas, self.dest.size, target)
+
+
+class ScaledPainter(SurfacePainter):
+    """screen.draw for a ScaledScreen: scales coordinates and font sizes."""
+
+    POINT_ARGS = ("pos", "center", "topleft", "topright", "bottomleft", "bottomright",
+                  "midtop", "midleft", "midbottom", "midright")
 
+    def line(self, start, end, color):
+        super().line(self._screen.point(start), self._screen.point(end), color)
 
-def choose_enemy_type(level_num):
-    """Return 0=SlimeNormal, 1=SlimeFire, 2=SlimeBlock, 3=SlimeSpike with level-based weights.
+    def circle(self, pos, radius, color):
+        super().circle(self._screen.point(pos), round(radius * self._screen.scale), color)
 
-    The weighting ramps up difficulty at higher levels by introducing
-    more aggressive slime types.
+    def filled_circle(self, pos, radius, color):
+        super().filled_circle(self._screen.point(pos), round(radius * self._screen.scale), color)
+
+    def rect(self, rect, color):
+        super().rect(self._screen.rect(rect), color)
+
+    def filled_rect(self, rect, color):
+        super().filled_rect(self._screen.rect(rect), color)
+
+    def text(self, *args, **kwargs):
+        scale = self._screen.scale
+        if len(args) > 1:
+            args = (args[0], self._screen.point(args[1])) + args[2:]
+        for name in self.POINT_ARGS:
+            if name in kwargs:
+                kwargs[name] = self._screen.point(kwargs[name])
+        for name in ("fontsize", "width"):
+            if kwargs.get(name):
+                kwargs[name] = max(1, round(kwargs[name] * scale))
+        super().text(*args, **kwargs)
+
+
+def canvas_rect(rect):
+    """Rect on `screen.surface` of an 800x600 rect (the same without scaling)."""
+    return render_target.rect(rect) if render_target else rect
+
+
+def read_controls():
+    """Read keyboard (WASD/Arrows) into the engine's InputState.
+
+    Held keys come from polling, taps since the last tick from input_buffer.
     """
-    r = random()
-    if level_num <= 1:
-        return 0  # only SlimeNormal
-    elif level_num == 2:
-        # 70% SlimeNormal, 30% SlimeFire
-        return 0 if r < 0.7 else 1
-    elif level_num == 3:
-        # 40% SlimeNormal, 35% SlimeFire, 25% SlimeBlock
-        return 0 if r < 0.4 else (1 if r < 0.75 else 2)
-    elif level_num == 4:
-        # 25% SlimeNormal, 35% SlimeFire, 25% SlimeBlock, 15% SlimeSpike
-        if r < 0.25:
-            return 0
-        elif r < 0.60:
-            return 1
-        elif r < 0.85:
-            return 2
-        else:
-            return 3
+    held = InputState(
+        left=keyboard.left or keyboard.a,
+        right=keyboard.right or keyboard.d,
+        up=keyboard.up or keyboard.w,
+        down=keyboard.down or keyboard.s,
+    )
+    controls, presses = input_buffer.tick(held)
+    input_latency.ticked(presses)
+    return controls
+
+
+def create_level_actors():
+    """Create the key and door sprites for the level just generated."""
+    global key_actor, door_actor
+    # Key actor (pre-scaled to 32x32) and door actor (already 40x40 = 1 tile)
+    key_actor = Actor("key_yellow", world.key_position)
+    door_actor = Actor("door_closed", world.door_position)
+
+
+def sync_actor(character):
+    """Create or refresh the Actor that draws an engine character."""
+    if character.actor is None:
+        character.actor = Actor(character.image, (character.x, character.y))
     else:
-        # Level 5+: 15% SlimeNormal, 30% SlimeFire, 30% SlimeBlock, 25% SlimeSpike
-        if r < 0.15:
-            return 0
-        elif r < 0.45:
-            return 1
-        elif r < 0.75:
-            return 2
-        else:
-            return 3
+        character.actor.image = character.image
+        character.actor.pos = (character.x, character.y)
+    return character.actor
+
+
+def handle_world_events():
+    """React to the events emitted by the world: sprites, music and SFX."""
+    for name, data in world.drain_events():
+        if name == "level_generated":
+            create_level_actors()
+            dirty_tracker.invalidate()
+            if recorder:
+                try:
+                    recorder.level_loaded(world)
+                except ValueError as error:
+                    print(f"Registrazione: {error}")
+        elif name == "key_collected":
+            # Update door image when key is collected
+            if door_actor:
+                door_actor.image = "door_open"
+        elif name == "game_started":
+            if music_enabled:
+                start_background_music()
+        elif name == "game_over":
+            stop_background_music()
+        if INPUT_LATENCY_REPORT and name in ("game_over", "victory", "quit"):
+            print("Latenza tasto -> frame:\n" + input_latency.report())
+            input_latency.reset()
+
+        if sound_enabled and name in EVENT_SOUNDS:
+            audio.play(EVENT_SOUNDS[name])
+        if telemetry:
+            telemetry.observe(name, data)
+        if memory_tracker and memory_tracker.observe(name, data):
+            print(memory_tracker.report())
 
 
 def create_menu():
@@ -614,45 +470,27 @@ def create_pause_menu():
 
 def pause_game():
     """Enter pause state and show the pause menu."""
-    global game_state
-    game_state = STATE_PAUSED
+    world.pause()
     create_pause_menu()
 
 
 def resume_game():
     """Resume the game from pause."""
-    global game_state
-    game_state = STATE_PLAYING
+    world.resume()
 
 
 def quit_to_menu():
     """Exit the current run and return to the main menu."""
-    global game_state
-    game_state = STATE_MENU
+    world.quit_to_menu()
+    handle_world_events()
     create_menu()
     stop_background_music()
 
 
 def start_game():
-    """Start a new game.
-
-    - Reset level, player, per-level timers
-    - Start music/SFX if enabled
-    """
-    global game_state, current_level, key_collected, player, level_time_accum, level_times
-    game_state = STATE_PLAYING
-    current_level = 1
-    key_collected = False
-    player = None  # reset player so health returns to max for a new game
-    level_times = []
-    level_time_accum = 0.0
-    generate_level(current_level)
-    
-    if music_enabled:
-        start_background_music()
-    
-    if sound_enabled:
-        sounds.start.play()
+    """Start a new game (the world resets level, player and timers)."""
+    world.start_game()
+    handle_world_events()
 
 
 def toggle_music():
@@ -664,7 +502,7 @@ def toggle_music():
     else:
         stop_background_music()
     if sound_enabled:
-        sounds.toggle.play()
+        audio.play("toggle")
 
 
 def toggle_sound():
@@ -672,108 +510,136 @@ def toggle_sound():
     global sound_enabled
     sound_enabled = not sound_enabled
     if sound_enabled:
-        sounds.toggle.play()
-
-
-def game_over():
-    """Handle game over: save time, stop music and play SFX."""
-    global game_state, level_time_accum, level_times
-    # Save current level time at the moment of defeat
-    level_times.append(level_time_accum)
-    level_time_accum = 0.0
-    game_state = STATE_GAME_OVER
-    stop_background_music()
-    if sound_enabled:
-        sounds.gameover.play()
+        audio.play("toggle")
 
 
-def victory():
-    """Handle victory: show screen and play victory SFX."""
-    global game_state
-    game_state = STATE_VICTORY
-    if sound_enabled:
-        sounds.victory.play()
-
+def update(dt):
+    """Advance the world while playing and react to its events.
 
-def next_level():
-    """Advance to the next level, saving the time of the level just finished."""
-    global current_level, key_collected, level_time_accum, level_times
-    # Save completed level time
-    level_times.append(level_time_accum)
-    level_time_accum = 0.0
-    current_level += 1
-    key_collected = False
-    
-    if current_level > 5:  # Win after 5 levels
-        victory()
+    Parameters:
+    - dt: delta time in seconds since the last frame
+    """
+    global idle_waited
+    if idle_waited:
+        # The last frame slept waiting for input: do not count the sleep
+        dt = min(dt, 1 / 60)
+        idle_waited = False
     else:
-        generate_level(current_level)
-        if sound_enabled:
-            sounds.nextlevel.play()
+        input_latency.frame_started()
+    if profile_capture.active:
+        profile_capture.begin_frame()
+    elif REDRAW_ON_CHANGE and idle_drawn_signature is not None and idle_screen_signature() == idle_drawn_signature:
+        wait_for_input(IDLE_WAIT)
+        idle_waited = True
+    update_game(dt)
 
 
-def update(dt):
-    """Update game logic for the current state.
+def wait_for_input(timeout):
+    """Sleep until an input event arrives (or `timeout` seconds), leaving it queued.
 
-    Parameters:
-    - dt: delta time in seconds since the last frame
+    event.wait() takes the first event off the queue: the whole queue is
+    taken and posted back in its original order, otherwise a key-up queued
+    behind it would be dispatched before its key-down.
     """
-    global key_collected, level_time_accum
-    
-    if game_state == STATE_MENU:
-        # Hover is handled by on_mouse_move(pos); nothing to update here
-        return
-    
-    elif game_state == STATE_PLAYING:
-        # Accumulate current level time
-        level_time_accum += dt
-        # Update player
-        player.update(dt)
-        
-        # Update enemies
-        for enemy in enemies:
-            enemy.update(dt, (player.x, player.y))
-            
-            # Check collision with player
-            if enemy.hitbox.colliderect(player.hitbox):
-                player.take_damage()
-        
-        # Check key collection (sprite 32x32, area pickup 24x24 centrata)
-        if not key_collected and key_position:
-            key_pickup_size = 24
-            half = key_pickup_size // 2
-            key_rect = Rect(key_position[0] - half, key_position[1] - half, key_pickup_size, key_pickup_size)
-            if player.hitbox.colliderect(key_rect):
-                key_collected = True
-                if sound_enabled:
-                    sounds.pickup.play()
-                # Update door image when key is collected
-                if door_actor:
-                    door_actor.image = "door_open"
-
-        # Check door interaction (hitbox 40x40 = 1 tile)
-        if key_collected and door_position:
-            door_rect = Rect(door_position[0] - 20, door_position[1] - 20, 40, 40)
-            if player.hitbox.colliderect(door_rect):
-                next_level()
+    event = pygame.event.wait(int(timeout * 1000))
+    if event.type != pygame.NOEVENT:
+        for queued in [event] + pygame.event.get():
+            pygame.event.post(queued)
+
+
+def idle_screen_signature():
+    """Everything a non-playing screen shows; None while playing (always redrawn)."""
+    state = world.state
+    if state == STATE_PLAYING or show_perf_overlay:
+        return None
+    if state == STATE_MENU:
+        return (state, music_enabled, sound_enabled, tuple(button.hovered for button in menu_buttons))
+    if state == STATE_PAUSED:
+        return (state, tuple(button.hovered for button in pause_buttons))
+    return (state, world.current_level, sum(world.level_times))
+
+
+def update_game(dt):
+    """One update step: quality governor, tuning reload, world, spectators."""
+    if governor:
+        governor.frame(dt)
+        governor.apply(world)
+    if tuning_watcher:
+        tuning = tuning_watcher.poll()
+        if tuning:
+            world.apply_tuning(tuning)
+            print(f"Tuning ricaricato da {tuning_watcher.path}")
+        elif tuning_watcher.error:
+            print(f"Tuning non valido, valori precedenti mantenuti:\n{tuning_watcher.error}")
+            tuning_watcher.error = None
+    if world.state == STATE_PLAYING:
+        world.update(dt, read_controls())
+        handle_world_events()
+        if recorder and world.state == STATE_PLAYING:
+            recorder.record(world)
+    else:
+        # Keys pressed in menus or while paused do not move the player later
+        input_buffer.discard()
+    if spectator:
+        spectator.publish(world)
 
 
 def draw():
     """Render the appropriate scene based on the current game state."""
+    global idle_drawn_signature, display_rects
+    display_rects = None
+    signature = idle_screen_signature() if REDRAW_ON_CHANGE else None
+    if signature is None or signature != idle_drawn_signature:
+        draw_scene()
+        if render_target:
+            render_target.present()
+    idle_drawn_signature = signature
+    if profile_capture.active:
+        files = profile_capture.end_frame(governor.status() if governor else None)
+        if files:
+            print("Profilo salvato: " + ", ".join(files))
+
+
+def draw_scene():
+    """Draw the screen for the current game state (and the F3 overlay)."""
+    global last_drawn_state, paused_frame, display_rects
+    if world.state != last_drawn_state:
+        # Menus and overlays repaint the whole screen: start over afterwards
+        dirty_tracker.invalidate()
+        last_drawn_state = world.state
+        paused_frame = None
+
+    if DIRTY_RECT_RENDERING and world.state == STATE_PLAYING:
+        draw_game_dirty()
+        if show_perf_overlay:
+            draw_perf_overlay()
+        if not render_target:
+            # A scaled canvas is presented whole by render_target.present()
+            display_rects = [tuple(rect) for rect in dirty_tracker.dirty_rects]
+        return
+
     screen.clear()
     
-    if game_state == STATE_MENU:
+    if world.state == STATE_MENU:
         draw_menu()
-    elif game_state == STATE_PLAYING:
+    elif world.state == STATE_PLAYING:
         draw_game()
-    elif game_state == STATE_GAME_OVER:
+    elif world.state == STATE_GAME_OVER:
         draw_game_over()
-    elif game_state == STATE_VICTORY:
+    elif world.state == STATE_VICTORY:
         draw_victory()
-    elif game_state == STATE_PAUSED:
-        # Draw game behind and overlay pause menu
-        draw_game()
+    elif world.state == STATE_PAUSED:
+        # Draw game behind and overlay pause menu; the game is frozen, so
+        # with REDRAW_ON_CHANGE its frame is drawn once and reused
+        if paused_frame is not None:
+            screen.surface.blit(paused_frame, (0, 0))
+        else:
+            draw_game()
+            if REDRAW_ON_CHANGE:
+                paused_frame = screen.surface.copy()
         draw_pause()
+    if show_perf_overlay:
+        draw_perf_overlay()
 
 
 def draw_menu():
@@ -807,34 +673,94 @@ def draw_menu():
 
 def draw_game():
     """Draw the game world (tiles, entities) and the HUD."""
+    draw_background()
+    draw_sprites()
+    draw_hud()
+
+
+def draw_background():
+    """Draw the static layer of the level: background, floor and walls."""
     screen.fill((30, 25, 35))
     
     # Draw floor tiles
-    for x, y in floor_tiles:
+    for x, y in world.floor_tiles:
         screen.blit("floor", (x, y))
     
     # Draw walls
-    for wall in walls:
+    for wall in world.walls:
         screen.blit("wall", (wall.x, wall.y))
-    
-    # Draw key if not collected (using scaled actor)
-    if not key_collected and key_actor:
-        key_actor.draw()
 
-    # Draw door (using scaled actor)
+
+def visible_sprites():
+    """Return {id: Actor} for the sprites of the level, in drawing order."""
+    sprites = {}
+    # Key if not collected, then door (both using scaled actors)
+    if not world.key_collected and key_actor:
+        sprites["key"] = key_actor
     if door_actor:
-        door_actor.draw()
-    
-    # Draw enemies
-    for enemy in enemies:
-        enemy.draw()
-    
-    # Draw player (with invulnerability flashing)
-    if player.invulnerable_timer <= 0 or int(player.invulnerable_timer * 10) % 2 == 0:
-        player.draw()
-    
-    # Draw HUD
-    draw_hud()
+        sprites["door"] = door_actor
+    for enemy in world.enemies:
+        sprites[id(enemy)] = sync_actor(enemy)
+    sprites["player"] = sync_actor(world.player)
+    return sprites
+
+
+def draw_sprites(sprites=None):
+    """Draw key, door, enemies and player (with invulnerability flashing)."""
+    if sprites is None:
+        sprites = visible_sprites()
+    player = world.player
+    player_visible = player.invulnerable_timer <= 0 or int(player.invulnerable_timer * 10) % 2 == 0
+    for sprite_id, actor in sprites.items():
+        if sprite_id != "player" or player_visible:
+            if render_target:
+                # Actor.draw() always targets the display: go through the canvas
+                screen.blit(actor.image, actor.topleft)
+            else:
+                actor.draw()
+
+
+def sprite_bounds(actor):
+    """800x600 rect to restore to erase `actor` (see ScaledScreen.blit_bounds)."""
+    if render_target:
+        return render_target.blit_bounds(actor.image, actor.topleft)
+    return bounds_of(actor)
+
+
+def draw_game_dirty():
+    """Gameplay frame in dirty-rect mode.
+
+    The floor and walls are rendered once per level into a cached copy of
+    the screen; each frame only the regions where sprites were or are now
+    get restored from it before the sprites are drawn again.
+    """
+    global background_surface, last_hud_signature
+    sprites = visible_sprites()
+    bounds = {sprite_id: sprite_bounds(actor) for sprite_id, actor in sprites.items()}
+    hud_rect = Rect(0, HEIGHT - HUD_HEIGHT, WIDTH, HUD_HEIGHT)
+    signature = hud_signature()
+
+    if dirty_tracker.full_redraw or background_surface is None:
+        screen.clear()
+        draw_background()
+        background_surface = screen.surface.copy()
+        draw_sprites(sprites)
+        draw_hud()
+        last_hud_signature = signature
+        dirty_tracker.commit_full(bounds)
+        return
+
+    dirty = dirty_tracker.update(bounds)
+    for rect in dirty:
+        area = canvas_rect(tuple(rect))
+        screen.surface.blit(background_surface, area, area)
+    draw_sprites(sprites)
+
+    # Sprites near the bottom edge overlap the HUD: redraw it on top
+    if signature != last_hud_signature or any(hud_rect.colliderect(tuple(r)) for r in dirty):
+        draw_hud()
+        dirty_tracker.add(hud_rect)
+        last_hud_signature = signature
 
 
 def draw_pause():
@@ -859,15 +785,29 @@ def draw_pause():
         button.draw()
 
 
+def hud_signature():
+    """Everything the HUD shows: it only needs re-rendering when this changes."""
+    return (world.player.health, world.key_collected, world.current_level)
+
+
 def draw_hud():
-    """Draw the bottom HUD: hearts, key icon and level label."""
+    """Draw the bottom HUD: hearts, key icon and level label.
+
+    At the governor's "cached HUD" tier the last rendered HUD is reused
+    until its content changes.
+    """
+    global hud_cache, hud_cache_signature
+    hud_rect = Rect(0, HEIGHT - HUD_HEIGHT, WIDTH, HUD_HEIGHT)
+    signature = hud_signature()
+    if governor and governor.cache_hud and hud_cache is not None and signature == hud_cache_signature:
+        screen.surface.blit(hud_cache, canvas_rect(hud_rect))
+        return
+
     # HUD background
-    screen.draw.filled_rect(
-        Rect(0, HEIGHT - HUD_HEIGHT, WIDTH, HUD_HEIGHT),
-        (40, 40, 50)
-    )
+    screen.draw.filled_rect(hud_rect, (40, 40, 50))
     
     # Draw health hearts
+    player = world.player
     y_center = HEIGHT - HUD_HEIGHT + (HUD_HEIGHT - HUD_ICON_PX) // 2
     for i in range(player.max_health):
         x = 20 + i * 35
@@ -878,17 +818,45 @@ def draw_hud():
             screen.blit("hud_heart_empty", (x, y))
 
     # Draw key indicator in HUD (sprite 32x32 already scaled)
-    if key_collected:
+    if world.key_collected:
         screen.blit("key_yellow", (WIDTH - 100, y_center))
 
     # Level number (Italian)
     screen.draw.text(
-        f"Livello {current_level}",
+        f"Livello {world.current_level}",
         center=(WIDTH//2, HEIGHT - HUD_HEIGHT//2),
         fontsize=24,
         color=(255, 255, 255)
     )
 
+    if governor and governor.cache_hud:
+        hud_cache = screen.surface.subsurface(canvas_rect(hud_rect)).copy()
+        hud_cache_signature = signature
+
+
+def draw_perf_overlay():
+    """Draw frame time, quality tier and SFX counters in the top-left corner (F3)."""
+    overlay_rect = Rect(0, 0, 700, 24)
+    if background_surface and DIRTY_RECT_RENDERING and world.state == STATE_PLAYING:
+        # Dirty-rect frames do not clear the screen: restore under the text
+        area = canvas_rect(overlay_rect)
+        screen.surface.blit(background_surface, area, area)
+        dirty_tracker.add(overlay_rect)
+    if governor:
+        status = governor.status()
+        text = f"{status['frame_ms']:.1f} ms  tier {status['tier']} ({status['tier_name']})"
+    else:
+        text = "adaptive quality off"
+    sfx = audio.stats()
+    text += f"  sfx {sfx['played']} played / {sfx['dropped']} dropped"
+    p50, p95 = input_latency.percentile(0.5), input_latency.percentile(0.95)
+    if p50 is not None:
+        text += f"  input {p50:.0f}/{p95:.0f} ms"
+    pacing = input_latency.percentile(0.5, input_latency.pacing)
+    if pacing is not None:
+        text += f"  wait {pacing:.0f} ms"
+    screen.draw.text(text, topleft=(6, 4), fontsize=20, color=(255, 255, 0))
+
 
 def draw_game_over():
     """Game over screen: level reached and total time of the run."""
@@ -902,13 +870,13 @@ def draw_game_over():
     )
     
     screen.draw.text(
-        f"Hai raggiunto il livello {current_level}",
+        f"Hai raggiunto il livello {world.current_level}",
         center=(WIDTH//2, HEIGHT//2 + 20),
         fontsize=32,
         color=(200, 200, 200)
     )
     # Total game time
-    total_seconds = sum(level_times)
+    total_seconds = sum(world.level_times)
     minutes = int(total_seconds // 60)
     seconds = total_seconds % 60
     screen.draw.text(
@@ -944,7 +912,7 @@ def draw_victory():
         color=(200, 200, 200)
     )
     # Total game time
-    total_seconds = sum(level_times)
+    total_seconds = sum(world.level_times)
     minutes = int(total_seconds // 60)
     seconds = total_seconds % 60
     screen.draw.text(
@@ -964,7 +932,9 @@ def draw_victory():
 
 def on_mouse_down(pos, button):
     """Handle mouse clicks in the main menu and pause menu."""
-    if game_state == STATE_MENU:
+    if render_target:
+        pos = render_target.to_view(pos)
+    if world.state == STATE_MENU:
         for menu_button in menu_buttons:
             if menu_button.rect.collidepoint(pos):
                 if menu_button.action == "start":
@@ -975,7 +945,7 @@ def on_mouse_down(pos, button):
                     toggle_sound()
                 elif menu_button.action == "exit":
                     exit()
-    elif game_state == STATE_PAUSED:
+    elif world.state == STATE_PAUSED:
         for menu_button in pause_buttons:
             if menu_button.rect.collidepoint(pos):
                 if menu_button.action == "resume":
@@ -985,24 +955,34 @@ def on_mouse_down(pos, button):
 
 
 def on_key_down(key):
-    """Handle special keys: SPACE (end screens), ESC/P (pause)."""
-    global game_state
-    
+    """Handle special keys: SPACE (end screens), ESC/P (pause), F3 (perf overlay), F9 (profile)."""
+    global show_perf_overlay
+    if key in DIRECTION_KEYS and world.state == STATE_PLAYING:
+        input_buffer.push(DIRECTION_KEYS[key], True)
+    if key == keys.F3:
+        show_perf_overlay = not show_perf_overlay
+        dirty_tracker.invalidate()
+    if key == keys.F9:
+        quality = governor.status() if governor else None
+        if profile_capture.start(world.current_level, len(world.enemies), world.state, quality):
+            print(f"Profilazione di {PROFILE_FRAMES} frame...")
     if key == keys.SPACE:
-        if game_state in [STATE_GAME_OVER, STATE_VICTORY]:
-            game_state = STATE_MENU
-            create_menu()
-            stop_background_music()
+        if world.state in [STATE_GAME_OVER, STATE_VICTORY]:
+            quit_to_menu()
     # ESC or P to pause/resume during gameplay
     if key in (keys.ESCAPE, keys.P):
-        if game_state == STATE_PLAYING:
+        if world.state == STATE_PLAYING:
             pause_game()
-        elif game_state == STATE_PAUSED:
+        elif world.state == STATE_PAUSED:
             resume_game()
 
 
-# Initialize the game
-create_menu()
+def on_key_up(key):
+    """Queue the release of a direction key."""
+    if key in DIRECTION_KEYS:
+        input_buffer.push(DIRECTION_KEYS[key], False)
+
+
 def start_background_music():
     """Start the looping background music (if available)."""
     try:
@@ -1018,15 +998,69 @@ def stop_background_music():
     except Exception:
         pass
 
+
+def present_display():
+    """Stand-in for pygame.display.flip(), which PgZero calls after draw().
+
+    In dirty-rect mode only the regions repainted this frame are copied to
+    the window (pygame.display.update); otherwise the whole display is flipped.
+    The frame is on screen afterwards, which closes the latency measurement.
+    """
+    if display_rects is None:
+        flip_display()
+    else:
+        pygame.display.update(display_rects)
+    input_latency.frame_presented()
+
+
 def on_mouse_move(pos):
     """Update the hover effect for buttons in the menu and pause screens."""
-    if game_state == STATE_MENU:
+    if render_target:
+        pos = render_target.to_view(pos)
+    if world.state == STATE_MENU:
         for button in menu_buttons:
             button.check_hover(pos)
-    elif game_state == STATE_PAUSED:
+    elif world.state == STATE_PAUSED:
         for button in pause_buttons:
             button.check_hover(pos)
 
+
+# Initialize the game
+create_menu()
+flip_display = pygame.display.flip
+pygame.display.flip = present_display
+if RENDER_SCALE != 1 or tuple(WINDOW_SIZE) != (WIDTH, HEIGHT):
+    screen = render_target = ScaledScreen(RENDER_SCALE, WINDOW_SIZE, INTEGER_SCALING)
+if LEVEL_BANK:
+    world.level_bank = LevelBank(LEVEL_BANK)
+for level, maps in AUTHORED_LEVELS.items():
+    if isinstance(maps, str):
+        world.authored_levels[level] = load_map(maps, level)
+    else:
+        world.authored_levels[level] = [load_map(path, level) for path in maps]
+if TUNING_FILE:
+    tuning_watcher = TuningWatcher(TUNING_FILE)
+    # First read at startup, without the reload message
+    world.apply_tuning(tuning_watcher.poll() or world.tuning)
+    if tuning_watcher.error:
+        print(tuning_watcher.error)
+        tuning_watcher.error = None
+if SPECTATOR_PORT:
+    spectator = SpectatorServer(port=SPECTATOR_PORT)
+    spectator.start_in_thread()
+if TELEMETRY_DIR:
+    os.makedirs(TELEMETRY_DIR, exist_ok=True)
+    session_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    telemetry = Telemetry(os.path.join(TELEMETRY_DIR, f"session-{session_id}.jsonl"), session=session_id)
+    atexit.register(telemetry.close)
+if RECORDING_DIR:
+    os.makedirs(RECORDING_DIR, exist_ok=True)
+    recorder = PositionRecorder(os.path.join(RECORDING_DIR, time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}.pos"))
+    atexit.register(recorder.close)
+if MEMORY_TRACKING:
+    memory_tracker = MemoryTracker()
+    memory_tracker.start()
+
 # Run info: in some macOS/Conda environments, direct startup
 # with `python main.py` may not open the window.
 # Use one of the following official PgZero commands instead.
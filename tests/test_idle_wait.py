@@ -0,0 +1,47 @@
+"""The idle wait of the menu/pause screens must not reorder queued input."""
+
+import os
+import sys
+import types
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("pgzero")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def game():
+    """main.py loaded the way pgzrun does, with a headless display."""
+    from pgzero import loaders, runner
+
+    path = os.path.join(ROOT, "main.py")
+    sys.path.insert(0, ROOT)
+    mod = types.ModuleType("main")
+    mod.__file__ = path
+    runner.prepare_mod(mod)
+    exec(compile(open(path, encoding="utf-8").read(), path, "exec"), mod.__dict__)
+    loaders.set_root(path)
+    yield mod
+    sys.path.remove(ROOT)
+
+
+def test_queued_key_events_keep_their_order(game):
+    pygame.event.clear()
+    for event_type in (pygame.KEYDOWN, pygame.KEYUP):
+        pygame.event.post(pygame.event.Event(event_type, key=pygame.K_LEFT, mod=0, unicode="", scancode=0))
+
+    game.wait_for_input(0.05)
+
+    events = [event.type for event in pygame.event.get() if event.type in (pygame.KEYDOWN, pygame.KEYUP)]
+    assert events == [pygame.KEYDOWN, pygame.KEYUP]
+
+
+def test_wait_times_out_on_an_empty_queue(game):
+    pygame.event.clear()
+    game.wait_for_input(0.01)
+    assert pygame.event.get() == []
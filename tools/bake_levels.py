@@ -0,0 +1,72 @@
+"""Bake a level bank: generate, validate and store thousands of levels.
+
+Every (level, seed) pair is generated exactly as the game would generate
+it for World(seed), reduced to a LevelLayout, validated (entities on
+floor tiles, key and door reachable) and packed into a fixed-size record.
+Layouts can also be curated by path length (spawn -> key -> door, in
+tiles) to keep only easier or harder variants of each level.
+
+Usage (from the project folder):
+  python -m tools.bake_levels levels.bin --per-level 2000
+  python -m tools.bake_levels hard.bin --levels 4 5 --min-path 30
+"""
+
+import argparse
+import os
+import time
+
+from engine.core import LEVEL_COUNT, LevelLayout, World
+from engine.levelbank import LevelBank, pack, path_length, validate, write_bank
+
+
+def bake(levels, per_level, min_path=0, max_path=None):
+    """Return (records, rejected) for seeds 0..per_level-1 of each level."""
+    records = []
+    rejected = 0
+    for level in levels:
+        for seed in range(per_level):
+            world = World(seed=seed)
+            world.current_level = level
+            world.generate_level(level)
+            layout = LevelLayout.from_world(world)
+            path = path_length(layout)
+            if validate(layout) or path < min_path or (max_path is not None and path > max_path):
+                rejected += 1
+                continue
+            records.append((level, seed, pack(layout, seed, path)))
+    return records, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", help="bank file to write")
+    parser.add_argument("--levels", type=int, nargs="+", default=list(range(1, LEVEL_COUNT + 1)))
+    parser.add_argument("--per-level", type=int, default=2000, help="seeds tried per level")
+    parser.add_argument("--min-path", type=int, default=0, help="shortest spawn -> key -> door path kept")
+    parser.add_argument("--max-path", type=int, default=None, help="longest spawn -> key -> door path kept")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    records, rejected = bake(args.levels, args.per_level, args.min_path, args.max_path)
+    write_bank(args.out, records)
+    elapsed = time.perf_counter() - started
+    print(f"{len(records)} levels baked, {rejected} rejected, "
+          f"{os.path.getsize(args.out) / 1024:.0f} KiB in {elapsed:.1f} s")
+
+    # Read the file back the way the game does and time the loads
+    bank = LevelBank(args.out)
+    world = World(seed=0)
+    world.start_game()
+    world.level_bank = bank
+    started = time.perf_counter()
+    for index in range(len(bank)):
+        world.load_layout(bank.layout(index))
+        world.drain_events()
+    elapsed = time.perf_counter() - started
+    if len(bank):
+        print(f"load: {elapsed * 1e6 / len(bank):.0f} us per level ({len(bank)} levels)")
+    bank.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Tile-resolution heatmaps from position recordings and telemetry (NumPy).
+
+Inputs, in any mix of files and folders:
+- `.pos` recordings (main.py RECORDING_DIR, tools/record_runs.py) with
+  their `.layouts` file: player and enemy occupancy, per layout and per level
+- telemetry sessions (`.jsonl`/`.csv`): where the player got hit and died,
+  per level
+
+Recordings are memory-mapped and folded into the histograms in slices of
+`--batch` records with one `np.bincount` per slice, so millions of ticks
+take seconds. Every map is rendered as a PNG over the level itself: the
+layout's walls and floor for per-layout maps; for per-level maps, walls
+are shaded by how often each tile was a wall in the recorded layouts.
+
+NumPy is only needed by this tool (pip install numpy); the game does not
+use it.
+
+Usage (from the project folder):
+  python -m tools.heatmap recordings/ telemetry/ --out heatmaps
+  python -m tools.heatmap recordings/bot.pos --layouts 3
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("tools.heatmap needs NumPy: pip install numpy")
+
+from engine.core import GRID_HEIGHT, GRID_WIDTH, TILE_SIZE
+from engine.levelbank import LevelBank
+from engine.recording import HEADER, MAGIC, layouts_path
+from engine.telemetry import read_records
+
+CELLS = GRID_WIDTH * GRID_HEIGHT
+# Maps drawn from recordings and from telemetry
+OCCUPANCY = ("player", "enemies")
+EVENTS = ("hits", "deaths")
+POSITION_DTYPE = np.dtype([("layout", "<u4"), ("kind", "u1"), ("pad", "u1"), ("x", "<i2"), ("y", "<i2")])
+
+
+def input_files(paths):
+    """Yield recordings and telemetry sessions found in files and folders."""
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                if entry.is_file() and entry.name.endswith((".pos", ".jsonl", ".csv")):
+                    yield entry.path
+        else:
+            yield path
+
+
+def tile_index(x, y):
+    """Flat tile index (ty * GRID_WIDTH + tx) of pixel positions, clipped to the grid."""
+    tx = np.clip(x // TILE_SIZE, 0, GRID_WIDTH - 1)
+    ty = np.clip(y // TILE_SIZE, 0, GRID_HEIGHT - 1)
+    return ty.astype(np.int64) * GRID_WIDTH + tx
+
+
+class Heatmaps:
+    """Histograms accumulated over any number of recordings and sessions.
+
+    - batch: records folded per np.bincount call
+    """
+
+    def __init__(self, batch=1 << 20):
+        self.batch = batch
+        # Distinct layouts: identity -> slot, plus level and walls per slot
+        self.slots = {}
+        self.layout_levels = []
+        self.layout_walls = []
+        # (slot, player/enemies, tile) counts, grown as layouts appear
+        self.occupancy = np.zeros((0, 2, CELLS), dtype=np.int64)
+        # level -> (hits/deaths, tile) counts from telemetry
+        self.events = defaultdict(lambda: np.zeros((2, CELLS), dtype=np.int64))
+        self.records = 0
+
+    def _layout_slots(self, path):
+        """Map the layout ids of one recording to global slots (same layout, same slot)."""
+        bank = LevelBank(layouts_path(path))
+        lut = np.zeros(len(bank), dtype=np.int64)
+        for index in range(len(bank)):
+            level, layout_id = bank.key(index)
+            layout = bank.layout(index)
+            identity = (level, frozenset(layout.walls), layout.player, layout.key, layout.door,
+                        tuple(layout.enemies))
+            slot = self.slots.get(identity)
+            if slot is None:
+                slot = self.slots[identity] = len(self.slots)
+                walls = np.zeros(CELLS, dtype=bool)
+                for tx, ty in layout.walls:
+                    walls[ty * GRID_WIDTH + tx] = True
+                self.layout_levels.append(level)
+                self.layout_walls.append(walls)
+            if layout_id >= len(lut):
+                lut = np.resize(lut, layout_id + 1)
+            lut[layout_id] = slot
+        bank.close()
+        if len(self.slots) > len(self.occupancy):
+            grown = np.zeros((len(self.slots), 2, CELLS), dtype=np.int64)
+            grown[:len(self.occupancy)] = self.occupancy
+            self.occupancy = grown
+        return lut
+
+    def add_recording(self, path):
+        """Fold one `.pos` recording into the occupancy histograms."""
+        with open(path, "rb") as f:
+            magic, _version, record_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or record_size != POSITION_DTYPE.itemsize:
+            raise ValueError(f"{path}: not a position recording")
+        lut = self._layout_slots(path)
+        if os.path.getsize(path) == HEADER.size:
+            return
+        positions = np.memmap(path, dtype=POSITION_DTYPE, mode="r", offset=HEADER.size)
+        local = np.zeros(len(lut) * 2 * CELLS, dtype=np.int64)
+        for start in range(0, len(positions), self.batch):
+            chunk = positions[start:start + self.batch]
+            enemy = (chunk["kind"] > 0).astype(np.int64)
+            key = (chunk["layout"].astype(np.int64) * 2 + enemy) * CELLS + tile_index(chunk["x"], chunk["y"])
+            local += np.bincount(key, minlength=local.size)
+            self.records += len(chunk)
+        # Layouts repeated within the recording share a slot: np.add.at sums them
+        np.add.at(self.occupancy, lut, local.reshape(len(lut), 2, CELLS))
+        del positions
+
+    def add_telemetry(self, path):
+        """Fold the hit and death positions of one telemetry session."""
+        levels, kinds, xs, ys = [], [], [], []
+        for record in read_records(path):
+            if record["event"] in ("hit", "death"):
+                levels.append(record["level"] or 0)
+                kinds.append(record["event"] == "death")
+                xs.append(record["x"])
+                ys.append(record["y"])
+                if len(xs) >= self.batch:
+                    self._fold_events(levels, kinds, xs, ys)
+                    levels, kinds, xs, ys = [], [], [], []
+        if xs:
+            self._fold_events(levels, kinds, xs, ys)
+
+    def _fold_events(self, levels, kinds, xs, ys):
+        levels = np.asarray(levels, dtype=np.int64)
+        key = np.asarray(kinds, dtype=np.int64) * CELLS + tile_index(
+            np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64))
+        for level in np.unique(levels):
+            mask = levels == level
+            self.events[int(level)] += np.bincount(key[mask], minlength=2 * CELLS).reshape(2, CELLS)
+        self.records += len(key)
+
+    def levels(self):
+        """Levels that have any data, sorted."""
+        return sorted(set(self.layout_levels) | set(self.events))
+
+    def level_maps(self, level):
+        """{map name: tile counts} and the wall frequency of one level."""
+        maps = {}
+        slots = [slot for slot, slot_level in enumerate(self.layout_levels) if slot_level == level]
+        walls = np.zeros(CELLS)
+        if slots:
+            occupancy = self.occupancy[slots]
+            maps.update(zip(OCCUPANCY, occupancy.sum(axis=0)))
+            # Wall frequency weighted by the ticks played on each layout
+            ticks = occupancy[:, 0].sum(axis=1).astype(float)
+            stacked = np.array([self.layout_walls[slot] for slot in slots], dtype=float)
+            weights = ticks if ticks.sum() else np.ones(len(slots))
+            walls = weights @ stacked / weights.sum()
+        else:
+            walls[border_mask()] = 1.0
+        if level in self.events:
+            maps.update(zip(EVENTS, self.events[level]))
+        return maps, walls
+
+    def busiest_layouts(self, count):
+        """Slots of the `count` layouts with most recorded ticks."""
+        ticks = self.occupancy[:, 0].sum(axis=1)
+        return [int(slot) for slot in np.argsort(-ticks, kind="stable")[:count] if ticks[slot]]
+
+
+def border_mask():
+    """Flat mask of the border tiles (walls of every generated level)."""
+    mask = np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=bool)
+    mask[[0, -1], :] = True
+    mask[:, [0, -1]] = True
+    return mask.ravel()
+
+
+def heat_colors(counts):
+    """RGBA per tile: transparent where 0, blue -> yellow -> red by log count."""
+    counts = counts.astype(float)
+    rgba = np.zeros((CELLS, 4), dtype=np.uint8)
+    if counts.max() <= 0:
+        return rgba
+    t = np.log1p(counts) / np.log1p(counts.max())
+    rgba[:, 0] = np.clip(2 * t, 0, 1) * 255
+    rgba[:, 1] = np.clip(1.5 - abs(2 * t - 1) * 1.5, 0, 1) * 255
+    rgba[:, 2] = np.clip(1 - 2 * t, 0, 1) * 255
+    rgba[:, 3] = np.where(counts > 0, 40 + 140 * t, 0)
+    return rgba
+
+
+def render(path, counts, walls, title, images):
+    """Save one heatmap PNG: floor, walls (alpha = wall frequency), heat overlay."""
+    import pygame
+
+    floor, wall = images
+    surface = pygame.Surface((GRID_WIDTH * TILE_SIZE, GRID_HEIGHT * TILE_SIZE))
+    for index in range(CELLS):
+        pos = ((index % GRID_WIDTH) * TILE_SIZE, (index // GRID_WIDTH) * TILE_SIZE)
+        surface.blit(floor, pos)
+        if walls[index] > 0:
+            wall.set_alpha(int(255 * walls[index]))
+            surface.blit(wall, pos)
+    wall.set_alpha(255)
+
+    # Tile colors scaled up to pixels in one go
+    rgba = heat_colors(counts).reshape(GRID_HEIGHT, GRID_WIDTH, 4)
+    pixels = np.ascontiguousarray(rgba.repeat(TILE_SIZE, axis=0).repeat(TILE_SIZE, axis=1))
+    overlay = pygame.image.frombuffer(pixels.tobytes(), surface.get_size(), "RGBA")
+    surface.blit(overlay, (0, 0))
+
+    font = pygame.font.Font(None, 24)
+    surface.blit(font.render(title, True, (255, 255, 255), (0, 0, 0)), (6, 6))
+    pygame.image.save(surface, path)
+
+
+def hottest(counts, top):
+    """Text list of the `top` busiest tiles."""
+    order = np.argsort(-counts, kind="stable")[:top]
+    return ", ".join(
+        f"({index % GRID_WIDTH}, {index // GRID_WIDTH}) {counts[index]}" for index in order if counts[index]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="recordings, telemetry sessions or folders")
+    parser.add_argument("--out", default="heatmaps", help="folder for the PNG files")
+    parser.add_argument("--layouts", type=int, default=5, help="busiest layouts rendered one by one")
+    parser.add_argument("--batch", type=int, default=1 << 20, help="records per NumPy batch")
+    parser.add_argument("--top", type=int, default=5, help="hottest tiles listed per map")
+    args = parser.parse_args()
+
+    heatmaps = Heatmaps(batch=args.batch)
+    started = time.perf_counter()
+    for path in input_files(args.paths):
+        if path.endswith(".pos"):
+            heatmaps.add_recording(path)
+        else:
+            heatmaps.add_telemetry(path)
+    elapsed = time.perf_counter() - started
+    print(f"{heatmaps.records} records, {len(heatmaps.slots)} layouts folded in {elapsed:.2f} s")
+
+    import pygame
+
+    pygame.font.init()
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    images = tuple(pygame.image.load(os.path.join(base, "images", f"{name}.png")) for name in ("floor", "wall"))
+    os.makedirs(args.out, exist_ok=True)
+    written = 0
+    for level in heatmaps.levels():
+        maps, walls = heatmaps.level_maps(level)
+        for name, counts in maps.items():
+            if counts.any():
+                print(f"level {level} {name}: {hottest(counts, args.top)}")
+                render(os.path.join(args.out, f"level-{level}-{name}.png"), counts, walls,
+                       f"Livello {level} - {name}", images)
+                written += 1
+    for rank, slot in enumerate(heatmaps.busiest_layouts(args.layouts), 1):
+        level = heatmaps.layout_levels[slot]
+        walls = heatmaps.layout_walls[slot].astype(float)
+        for name, counts in zip(OCCUPANCY, heatmaps.occupancy[slot]):
+            render(os.path.join(args.out, f"layout-{rank}-level-{level}-{name}.png"), counts, walls,
+                   f"Layout {rank} (livello {level}) - {name}", images)
+            written += 1
+    print(f"{written} heatmaps written to {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
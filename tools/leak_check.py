@@ -0,0 +1,70 @@
+"""Cycle thousands of levels headless and fail if live objects keep growing.
+
+Each cycle plays a few ticks of the current level, then forces the level
+transition (next_level(), or game_over() every `--death-every` levels
+followed by a restart through start_game()). The MemoryTracker samples at
+every transition; after the warm-up, any growth of the tracked types
+(or of traced memory beyond `--max-growth-kib`) makes the exit status 1.
+
+Usage (from the project folder):
+  python -m tools.leak_check --levels 5000
+"""
+
+import argparse
+import sys
+from random import Random
+
+from engine.core import STATE_PLAYING, InputState, World
+from engine.memtrack import MemoryTracker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=30, help="ticks played on each level")
+    parser.add_argument("--death-every", type=int, default=7)
+    parser.add_argument("--warmup", type=int, default=20, help="transitions ignored at the start")
+    parser.add_argument("--max-growth-kib", type=float, default=64.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    tracker = MemoryTracker(keep_snapshots=False, warmup=args.warmup)
+    tracker.start()
+    world = World(seed=args.seed)
+    rng = Random(args.seed)
+    world.start_game()
+
+    for level in range(1, args.levels + 1):
+        if world.state != STATE_PLAYING:
+            world.start_game()
+        for _ in range(args.ticks):
+            controls = InputState(*(rng.random() < 0.5 for _ in range(4)))
+            world.update(1 / 60, controls)
+        if world.state == STATE_PLAYING:
+            if level % args.death_every == 0:
+                world.game_over()
+            else:
+                world.next_level()
+        for name, data in world.drain_events():
+            tracker.observe(name, data)
+
+    tracker.stop()
+    if not tracker.baselines:
+        print(f"only {tracker.taken} transitions sampled, all in the warm-up: use more --levels")
+        return 1
+    leaks = tracker.leaks()
+    # Traced memory, like the counts, is compared between same-label samples
+    traced = tracker.traced_growth
+    print(f"{tracker.taken} transitions sampled")
+    print(f"first after warm-up: {next(iter(tracker.baselines.values()))}")
+    print(f"last:                {tracker.samples[-1]}")
+    print(f"largest traced memory growth: {traced / 1024:+.1f} KiB")
+    if leaks or traced > args.max_growth_kib * 1024:
+        print(f"FAIL: growth {leaks or ''} {traced / 1024:+.1f} KiB")
+        return 1
+    print("OK: no growth")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
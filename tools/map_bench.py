@@ -0,0 +1,73 @@
+"""Time authored map loading against procedural generation.
+
+Three numbers, per level:
+- generate: World.generate_level(), as the game does without maps
+- map: parse_map() + World.load_layout() of the same level written as a map
+- parse only, on a large synthetic map (default 1000x1000 tiles), to show
+  the loader scales with the tiles that are not floor
+
+Usage (from the project folder):
+  python -m tools.map_bench
+  python -m tools.map_bench --levels 200 --big 2000
+"""
+
+import argparse
+import random
+import time
+
+from engine.core import LEVEL_COUNT, LevelLayout, World
+from engine.tilemap import format_map, parse_map
+
+
+def big_map(size, wall_share=0.2, enemies=500, seed=0):
+    """Text of a size x size map with random walls, spawn, key, door and enemies."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        rows.append(["#" if rng.random() < wall_share else "." for _ in range(size)])
+    free = rng.sample(range(size * size), 3 + enemies)
+    for char, cell in zip("PKD", free):
+        rows[cell // size][cell % size] = char
+    for cell in free[3:]:
+        rows[cell // size][cell % size] = rng.choice("nfbs")
+    return "\n".join("".join(row) for row in rows) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=100, help="levels timed per level number")
+    parser.add_argument("--big", type=int, default=1000, help="side of the synthetic map, in tiles")
+    args = parser.parse_args()
+
+    world = World(seed=0)
+    world.start_game()
+    generated = 0.0
+    loaded = 0.0
+    for level in range(1, LEVEL_COUNT + 1):
+        world.current_level = level
+        for seed in range(args.levels):
+            world.rng.seed(seed)
+            started = time.perf_counter()
+            world.generate_level(level)
+            generated += time.perf_counter() - started
+            text = format_map(LevelLayout.from_world(world))
+            world.drain_events()
+
+            started = time.perf_counter()
+            world.load_layout(parse_map(text, level=level))
+            loaded += time.perf_counter() - started
+            world.drain_events()
+    count = args.levels * LEVEL_COUNT
+    print(f"generate:   {generated * 1e6 / count:.0f} us per level ({count} levels)")
+    print(f"map + load: {loaded * 1e6 / count:.0f} us per level")
+
+    text = big_map(args.big)
+    started = time.perf_counter()
+    layout = parse_map(text, size=None)
+    elapsed = time.perf_counter() - started
+    print(f"parse {args.big}x{args.big}: {elapsed * 1000:.0f} ms "
+          f"({len(layout.walls)} walls, {len(layout.enemies)} enemies)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Record headless bot runs as position recordings for tools/heatmap.py.
+
+A simple bot walks the shortest tile path to the key, then to the door,
+ignoring the slimes; its positions and the enemies' are written every
+tick with PositionRecorder, exactly as main.py does with RECORDING_DIR.
+Useful to get millions of ticks of data for a layout or spawn-rule change
+before anyone plays it.
+
+Usage (from the project folder):
+  python -m tools.record_runs recordings/bot.pos --runs 500
+  python -m tools.record_runs recordings/bot.pos --telemetry recordings/bot.jsonl
+"""
+
+import argparse
+import time
+from collections import deque
+
+from engine.core import GRID_HEIGHT, GRID_WIDTH, STATE_PLAYING, TILE_SIZE, InputState, World
+from engine.recording import PositionRecorder
+from engine.telemetry import Telemetry
+
+
+class PathBot:
+    """Follow the shortest tile path to the key, then to the door."""
+
+    def __init__(self, world, repath_ticks=15):
+        self.world = world
+        self.repath_ticks = repath_ticks
+        self.path = []
+        self.age = 0
+
+    def reset(self):
+        """Forget the path (new level or new run)."""
+        self.path = []
+        self.age = 0
+
+    def _tile(self, x, y):
+        return (int(x) // TILE_SIZE, int(y) // TILE_SIZE)
+
+    def _find_path(self, start, goal):
+        """Tiles from `start` (excluded) to `goal` by breadth-first search."""
+        walls = {(wall.x // TILE_SIZE, wall.y // TILE_SIZE) for wall in self.world.walls}
+        came_from = {start: None}
+        queue = deque([start])
+        while queue:
+            tile = queue.popleft()
+            if tile == goal:
+                break
+            tx, ty = tile
+            for nxt in ((tx + 1, ty), (tx - 1, ty), (tx, ty + 1), (tx, ty - 1)):
+                if (0 <= nxt[0] < GRID_WIDTH and 0 <= nxt[1] < GRID_HEIGHT
+                        and nxt not in walls and nxt not in came_from):
+                    came_from[nxt] = tile
+                    queue.append(nxt)
+        if goal not in came_from:
+            return []
+        path = []
+        while goal != start:
+            path.append(goal)
+            goal = came_from[goal]
+        path.reverse()
+        return path
+
+    def controls(self):
+        """InputState for this tick."""
+        world = self.world
+        player = world.player
+        target = world.door_position if world.key_collected else world.key_position
+        self.age += 1
+        if not self.path or self.age >= self.repath_ticks:
+            self.path = self._find_path(self._tile(player.x, player.y), self._tile(*target))
+            self.age = 0
+        here = self._tile(player.x, player.y)
+        while self.path and self.path[0] == here:
+            self.path.pop(0)
+        if not self.path:
+            dx, dy = target[0] - player.x, target[1] - player.y
+            return InputState(left=dx < -2, right=dx > 2, up=dy < -2, down=dy > 2)
+        # One axis at a time: the engine stops diagonal moves that touch a
+        # wall, so first center on the cross axis, then step to the tile
+        tx, ty = self.path[0]
+        dx = tx * TILE_SIZE + TILE_SIZE // 2 - player.x
+        dy = ty * TILE_SIZE + TILE_SIZE // 2 - player.y
+        if tx != here[0]:
+            if abs(dy) > 2:
+                return InputState(up=dy < 0, down=dy > 0)
+            return InputState(left=dx < 0, right=dx > 0)
+        if abs(dx) > 2:
+            return InputState(left=dx < 0, right=dx > 0)
+        return InputState(up=dy < 0, down=dy > 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", help="recording to write (.pos)")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--max-ticks", type=int, default=60 * 60 * 5, help="tick limit of one run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--telemetry", help="also write a telemetry session (hits, deaths) to this file")
+    args = parser.parse_args()
+
+    world = World(seed=args.seed)
+    bot = PathBot(world)
+    recorder = PositionRecorder(args.out)
+    telemetry = Telemetry(args.telemetry, session="bot") if args.telemetry else None
+
+    def handle_events():
+        for name, data in world.drain_events():
+            if name == "level_generated":
+                recorder.level_loaded(world)
+                bot.reset()
+            if telemetry:
+                telemetry.observe(name, data)
+
+    outcomes = {}
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        world.start_game()
+        bot.reset()
+        for _ in range(args.max_ticks):
+            handle_events()
+            if world.state != STATE_PLAYING:
+                break
+            world.update(1 / 60, bot.controls())
+            if world.state == STATE_PLAYING:
+                recorder.record(world)
+        outcomes[world.state] = outcomes.get(world.state, 0) + 1
+        if world.state == STATE_PLAYING:
+            world.quit_to_menu()
+        handle_events()
+    recorder.close()
+    if telemetry:
+        telemetry.close()
+    elapsed = time.perf_counter() - started
+    print(f"{args.runs} runs, {recorder.ticks} ticks, {recorder.layout_id + 1} layouts "
+          f"in {elapsed:.1f} s; outcomes {outcomes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Load test for the spectator server: one headless game, hundreds of viewers.
+
+A headless World plays with random inputs at 60 ticks per second and
+publishes every tick to a SpectatorServer running in its own thread, as in
+main.py. Simulated viewers connect from a second process. Slow viewers stop
+reading (with a small receive buffer) until the server has overflowed
+their queue and dropped their backlog, then catch up, then stall again:
+every slow viewer must go through the resync path at least once. The
+stream is about 2 KB/s, so with the kernel buffers a stalled viewer
+overflows after 3-5 seconds.
+
+The run passes when:
+- the p99 of `publish()` on the game thread is below --max-publish-ms
+  (default a quarter of a 60 Hz frame). The server thread and the viewer
+  process need CPU time of their own: on a single core they preempt the
+  game thread and the p99 measures the scheduler rather than publish()
+- every slow viewer was resynced (dropped backlog + keyframe) at least once
+- no fast viewer was ever resynced
+- every viewer ends with the same state as the game
+
+Exit status 1 on failure.
+
+Usage (from the project folder):
+  python -m tools.spectator_load --clients 300 --slow 30 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from random import Random
+
+from engine.core import STATE_PLAYING, InputState, World
+from engine.spectator import SpectatorServer, apply_message, snapshot
+
+# Time a slow viewer keeps reading after catching up, before stalling again
+CATCH_UP = 0.5
+
+
+async def viewer(index, port, shared, slow, results):
+    """One simulated viewer; slow viewers stall until the server resyncs them."""
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if slow:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2048)
+    sock.setblocking(False)
+    await loop.sock_connect(sock, ("127.0.0.1", port))
+    shared["ports"][index] = sock.getsockname()[1]
+    dropped = shared["dropped"]
+    running = shared["running"]
+    state = {}
+    received = keyframes = 0
+    pending = b""
+    resume_at = 0.0
+    while True:
+        if slow and running.is_set() and loop.time() >= resume_at:
+            # Stall until the server drops the backlog, then catch up
+            before = dropped[index]
+            while dropped[index] == before and running.is_set():
+                await asyncio.sleep(0.05)
+            resume_at = loop.time() + CATCH_UP
+        try:
+            chunk = await loop.sock_recv(sock, 65536)
+        except ConnectionError:
+            break
+        if not chunk:
+            break
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            message = json.loads(line)
+            apply_message(state, message)
+            received += 1
+            keyframes += bool(message.get("k"))
+            shared["ticks"][index] = message["n"]
+    sock.close()
+    results.put({"slow": slow, "received": received, "keyframes": keyframes, "state": state})
+
+
+def run_viewers(port, clients, slow, shared, results):
+    """Viewer process: connect every client and follow the stream to the end.
+
+    The viewers run in their own process, like real spectators, so their
+    JSON decoding does not compete with the game thread for the GIL.
+    """
+
+    async def main():
+        await asyncio.gather(*(
+            viewer(index, port, shared, index < slow, results)
+            for index in range(clients)
+        ))
+
+    asyncio.run(main())
+
+
+def relay_drops(server, shared, stop):
+    """Copy each viewer's server-side drop count to the viewer process."""
+    records = {}
+    ports = shared["ports"]
+    while not stop.wait(0.05):
+        if len(records) < len(ports):
+            by_port = {v.writer.get_extra_info("peername")[1]: v for v in list(server.viewers)}
+            for index, port in enumerate(ports):
+                if index not in records and port in by_port:
+                    records[index] = by_port[port]
+        for index, record in records.items():
+            shared["dropped"][index] = record.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--slow", type=int, default=30, help="how many viewers are slow")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--queue", type=int, default=16, help="server queue size per viewer")
+    parser.add_argument("--max-publish-ms", type=float, default=4.0, help="p99 budget of publish()")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = SpectatorServer(port=0, queue_size=args.queue)
+    server.start_in_thread()
+
+    shared = {
+        "ports": multiprocessing.Array("i", args.clients, lock=False),
+        "dropped": multiprocessing.Array("i", args.clients, lock=False),
+        "ticks": multiprocessing.Array("i", args.clients, lock=False),
+        "running": multiprocessing.Event(),
+    }
+    shared["running"].set()
+    results = multiprocessing.Queue()
+    viewers = multiprocessing.Process(
+        target=run_viewers,
+        args=(server.port, args.clients, args.slow, shared, results),
+    )
+    viewers.start()
+    while len(server.viewers) < args.clients:
+        time.sleep(0.01)
+    stop_relay = threading.Event()
+    relay = threading.Thread(target=relay_drops, args=(server, shared, stop_relay))
+    relay.start()
+
+    # Game thread: fixed 60 Hz ticks, restart when a run ends
+    world = World(seed=args.seed)
+    world.start_game()
+    rng = Random(args.seed)
+    controls = InputState()
+    publish_times = []
+    dt = 1 / 60
+    next_tick = time.perf_counter()
+    end = next_tick + args.seconds
+    while time.perf_counter() < end:
+        if rng.random() < 0.05:
+            controls = InputState(*(rng.random() < 0.5 for _ in range(4)))
+        if world.state != STATE_PLAYING:
+            world.start_game()
+        world.update(dt, controls)
+        world.drain_events()
+        start = time.perf_counter()
+        server.publish(world)
+        publish_times.append(time.perf_counter() - start)
+        next_tick += dt
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    # Every viewer reads at full speed now: wait until all have the last tick
+    shared["running"].clear()
+    deadline = time.perf_counter() + 5
+    while min(shared["ticks"]) < server.tick and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    stop_relay.set()
+    relay.join()
+    final = snapshot(world)
+    dropped = sum(v.dropped for v in server.viewers)
+    server.stop()
+    stats = [results.get(timeout=10) for _ in range(args.clients)]
+    viewers.join()
+
+    if os.cpu_count() == 1:
+        print("note: single CPU, publish() times include the viewer process")
+    publish_ms = sorted(t * 1000 for t in publish_times)
+    p99 = publish_ms[int(len(publish_ms) * 0.99)]
+    print(f"ticks published:  {len(publish_ms)} to {args.clients} viewers ({args.slow} slow)")
+    print(f"publish() ms:     median {statistics.median(publish_ms):.3f}  "
+          f"p99 {p99:.3f}  max {publish_ms[-1]:.3f}")
+    failures = []
+    if p99 > args.max_publish_ms:
+        failures.append(f"publish() p99 {p99:.3f} ms over the {args.max_publish_ms} ms budget")
+    for label, slow in (("fast", False), ("slow", True)):
+        group = [s for s in stats if s["slow"] == slow]
+        if not group:
+            continue
+        in_sync = sum(1 for s in group if all(s["state"].get(k) == v for k, v in final.items()))
+        # Every keyframe after the first one is a resync
+        counts = [s["keyframes"] - 1 for s in group]
+        print(f"{label} viewers:     msgs/viewer {statistics.mean(s['received'] for s in group):.0f}  "
+              f"resyncs/viewer min {min(counts)} max {max(counts)}  "
+              f"in sync at the end {in_sync}/{len(group)}")
+        if in_sync < len(group):
+            failures.append(f"{len(group) - in_sync} {label} viewers out of sync at the end")
+        if slow and min(counts) < 1:
+            failures.append(f"{counts.count(0)} slow viewers never overflowed: "
+                            f"run longer than {args.seconds:g} s or use a smaller --queue")
+        if not slow and max(counts) > 0:
+            failures.append(f"{sum(1 for c in counts if c)} fast viewers were resynced")
+    print(f"messages dropped for slow viewers: {dropped}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
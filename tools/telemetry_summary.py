@@ -0,0 +1,105 @@
+"""Summarize telemetry session files (JSONL or CSV) in a streaming fashion.
+
+Files are read one record at a time and folded into running counters, so
+thousands of sessions are summarized without loading them in memory.
+
+Usage (from the project folder):
+  python -m tools.telemetry_summary telemetry/
+  python -m tools.telemetry_summary telemetry/session-*.jsonl --top 5
+"""
+
+import argparse
+import os
+from collections import Counter, defaultdict
+
+from engine.core import TILE_SIZE
+from engine.telemetry import read_records
+
+
+def session_files(paths):
+    """Yield the session files found in the given files and folders."""
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                if entry.is_file() and entry.name.endswith((".jsonl", ".csv")):
+                    yield entry.path
+        else:
+            yield path
+
+
+class Summary:
+    """Running totals over any number of telemetry records."""
+
+    def __init__(self):
+        self.files = 0
+        self.records = 0
+        self.runs = 0
+        self.started = Counter()
+        self.outcomes = defaultdict(Counter)
+        self.completed_time = Counter()
+        self.damage = Counter()
+        self.enemy_mix = defaultdict(Counter)
+        self.death_tiles = Counter()
+
+    def add(self, record):
+        """Fold one record into the totals."""
+        self.records += 1
+        event = record["event"]
+        level = record.get("level")
+        if event == "level_start":
+            self.started[level] += 1
+            if level == 1:
+                self.runs += 1
+            self.enemy_mix[level].update(record.get("enemies", {}))
+        elif event == "level_end":
+            self.outcomes[level][record["outcome"]] += 1
+            self.damage[level] += record.get("damage", 0)
+            if record["outcome"] == "completed":
+                self.completed_time[level] += record["time"]
+        elif event == "death":
+            tile = (int(record["x"]) // TILE_SIZE, int(record["y"]) // TILE_SIZE)
+            self.death_tiles[tile] += 1
+
+    def report(self, top=10):
+        """Return the summary as printable text."""
+        lines = [f"{self.files} files, {self.records} records, {self.runs} runs", ""]
+        lines.append("level  started  completed  deaths  quits  avg time (s)  avg damage  enemy mix")
+        for level in sorted(self.started):
+            outcomes = self.outcomes[level]
+            ended = sum(outcomes.values())
+            completed = outcomes["completed"]
+            avg_time = self.completed_time[level] / completed if completed else 0.0
+            avg_damage = self.damage[level] / ended if ended else 0.0
+            total = sum(self.enemy_mix[level].values()) or 1
+            mix = ", ".join(
+                f"{name} {count * 100 / total:.0f}%"
+                for name, count in self.enemy_mix[level].most_common()
+            )
+            lines.append(
+                f"{level:>5}  {self.started[level]:>7}  {completed:>9}  {outcomes['death']:>6}  "
+                f"{outcomes['quit']:>5}  {avg_time:>12.2f}  {avg_damage:>10.2f}  {mix}"
+            )
+        if self.death_tiles:
+            lines.append("")
+            lines.append(f"top {top} death tiles (tx, ty): deaths")
+            for tile, count in self.death_tiles.most_common(top):
+                lines.append(f"  {tile}: {count}")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="session files or folders")
+    parser.add_argument("--top", type=int, default=10, help="death tiles to list")
+    args = parser.parse_args()
+
+    summary = Summary()
+    for path in session_files(args.paths):
+        summary.files += 1
+        for record in read_records(path):
+            summary.add(record)
+    print(summary.report(args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Dungeon Escape spectator viewer (PgZero)
+
+Draws a live run streamed by the game's spectator server (see
+SPECTATOR_PORT in main.py and engine/spectator.py). The viewer only keeps
+the state rebuilt from the delta stream: it never runs the game rules.
+
+How to run (with the game already running and SPECTATOR_PORT = 8765):
+  python -m pgzero viewer.py
+"""
+
+import asyncio
+import threading
+
+import pgzrun
+from engine.core import (
+    WIDTH,
+    HEIGHT,
+    TILE_SIZE,
+    GRID_WIDTH,
+    GRID_HEIGHT,
+    HUD_HEIGHT,
+    STATE_PLAYING,
+    STATE_PAUSED,
+)
+from engine.spectator import watch
+
+SPECTATOR_HOST = "127.0.0.1"
+SPECTATOR_PORT = 8765
+
+# Sprite used for each enemy kind (index in engine.core.ENEMY_TYPES)
+ENEMY_IMAGES = [
+    "enemies/slime_normal_rest",
+    "enemies/slime_fire_rest",
+    "enemies/slime_block_rest",
+    "enemies/slime_spike_rest",
+]
+
+# Latest state rebuilt from the stream. The network thread never changes
+# the dict draw() is reading: it publishes a new one per message.
+latest_state = {}
+connected = False
+
+
+def on_state(current):
+    """Called by the network thread for every message received."""
+    global connected, latest_state
+    # Shallow copy: apply_message() replaces field values, never mutates them
+    latest_state = dict(current)
+    connected = True
+
+
+def receive():
+    """Network thread: follow the stream until the server goes away."""
+    global connected
+    try:
+        asyncio.run(watch(SPECTATOR_HOST, SPECTATOR_PORT, on_state))
+    except OSError:
+        pass
+    connected = False
+
+
+def update():
+    """Nothing to simulate: defined so that PgZero redraws every frame."""
+
+
+def draw():
+    """Draw the last received state."""
+    # One reference for the whole frame, even if a new state arrives meanwhile
+    state = latest_state
+    screen.fill((30, 25, 35))
+    if not connected or state.get("st") not in (STATE_PLAYING, STATE_PAUSED):
+        message = "In attesa della partita..." if connected else "Nessuna partita da guardare"
+        screen.draw.text(message, center=(WIDTH//2, HEIGHT//2), fontsize=32, color=(200, 200, 200))
+        return
+
+    # Border + internal walls, floor everywhere else
+    walls = {tuple(tile) for tile in state.get("w", [])}
+    for tx in range(GRID_WIDTH):
+        for ty in range(GRID_HEIGHT):
+            border = tx in (0, GRID_WIDTH - 1) or ty in (0, GRID_HEIGHT - 1)
+            image = "wall" if border or (tx, ty) in walls else "floor"
+            screen.blit(image, (tx * TILE_SIZE, ty * TILE_SIZE))
+
+    if state.get("kp") and not state.get("key"):
+        screen.blit("key_yellow", (state["kp"][0] - 16, state["kp"][1] - 16))
+    if state.get("dp"):
+        door = "door_open" if state.get("key") else "door_closed"
+        screen.blit(door, (state["dp"][0] - 20, state["dp"][1] - 20))
+    for kind, x, y in state.get("e", []):
+        screen.blit(ENEMY_IMAGES[kind], (x - 16, y - 16))
+    if state.get("p"):
+        x, y, health = state["p"]
+        screen.blit("characters/character_beige_idle", (x - 16, y - 16))
+        screen.draw.text(
+            f"Livello {state.get('lv')}  |  Vita {health}",
+            center=(WIDTH//2, HEIGHT - HUD_HEIGHT//2),
+            fontsize=24,
+            color=(255, 255, 255)
+        )
+
+
+threading.Thread(target=receive, name="viewer", daemon=True).start()